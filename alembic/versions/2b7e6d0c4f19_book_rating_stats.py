@@ -0,0 +1,39 @@
+"""book rating stats (review count)
+
+Revision ID: 2b7e6d0c4f19
+Revises: 9d3f1b7c2a84
+Create Date: 2026-10-18 16:41:09.552803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e6d0c4f19'
+down_revision: Union[str, Sequence[str], None] = '9d3f1b7c2a84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('book_rating_stats',
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.book_id'], ),
+    sa.PrimaryKeyConstraint('book_id')
+    )
+    # 기존 리뷰로 초기값 채우기
+    op.execute(
+        'INSERT INTO book_rating_stats (book_id, review_count, updated_at) '
+        'SELECT book_id, COUNT(*), CURRENT_TIMESTAMP FROM reviews GROUP BY book_id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('book_rating_stats')
@@ -0,0 +1,68 @@
+"""token blocklist keyed by token hash with expiry
+
+Revision ID: 5e8a0f37b6d2
+Revises: c41d9e2a6f58
+Create Date: 2026-10-18 12:20:31.804417
+
+"""
+import hashlib
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import jwt
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a0f37b6d2'
+down_revision: Union[str, Sequence[str], None] = 'c41d9e2a6f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('token_blocklist_new',
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('token_hash')
+    )
+
+    # 기존 토큰 원문 -> 해시 + 만료 시각 (이미 만료된 토큰은 옮기지 않음)
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    rows = []
+    for token, created_at in bind.execute(sa.text('SELECT token, created_at FROM token_blocklist')):
+        try:
+            exp = jwt.decode(token, options={'verify_signature': False}).get('exp')
+        except jwt.PyJWTError:
+            continue
+        if not exp or datetime.utcfromtimestamp(exp) <= now:
+            continue
+        rows.append({
+            'token_hash': hashlib.sha256(token.encode('utf-8')).hexdigest(),
+            'expires_at': datetime.utcfromtimestamp(exp),
+            'created_at': created_at,
+        })
+    if rows:
+        new_table = sa.table('token_blocklist_new',
+            sa.column('token_hash', sa.String), sa.column('expires_at', sa.DateTime), sa.column('created_at', sa.DateTime))
+        op.bulk_insert(new_table, rows)
+
+    op.drop_table('token_blocklist')
+    op.rename_table('token_blocklist_new', 'token_blocklist')
+    op.create_index(op.f('ix_token_blocklist_expires_at'), 'token_blocklist', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 해시에서 원문 토큰은 복원할 수 없으므로 빈 테이블로 되돌림
+    op.drop_index(op.f('ix_token_blocklist_expires_at'), table_name='token_blocklist')
+    op.drop_table('token_blocklist')
+    op.create_table('token_blocklist',
+    sa.Column('token', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('token')
+    )
@@ -0,0 +1,70 @@
+"""book rating stats sum, histogram and average
+
+Revision ID: 6f1c3a9e8b27
+Revises: 2b7e6d0c4f19
+Create Date: 2026-10-18 18:12:36.204519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1c3a9e8b27'
+down_revision: Union[str, Sequence[str], None] = '2b7e6d0c4f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATING_COLUMNS = ['rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in RATING_COLUMNS:
+        op.add_column('book_rating_stats', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('book_rating_stats', sa.Column('rating_avg', sa.DECIMAL(precision=3, scale=2), nullable=False, server_default='0'))
+    op.create_index('ix_book_rating_stats_avg', 'book_rating_stats', ['rating_avg', 'book_id'], unique=False)
+    op.create_index('ix_book_rating_stats_count', 'book_rating_stats', ['review_count', 'book_id'], unique=False)
+
+    # 리뷰가 없는 도서도 행을 만들어 둠 (평점순 정렬은 INNER JOIN)
+    op.execute(
+        'INSERT INTO book_rating_stats (book_id, review_count, updated_at) '
+        'SELECT book_id, 0, CURRENT_TIMESTAMP FROM books '
+        'WHERE book_id NOT IN (SELECT book_id FROM book_rating_stats)'
+    )
+    # 기존 리뷰로 합계/히스토그램/평균 채우기
+    histogram = ', '.join(
+        f'rating_{r} = (SELECT COUNT(*) FROM reviews r WHERE r.book_id = book_rating_stats.book_id AND r.rating = {r})'
+        for r in range(1, 6)
+    )
+    op.execute(
+        'UPDATE book_rating_stats SET '
+        'rating_avg = COALESCE((SELECT ROUND(AVG(r.rating), 2) FROM reviews r WHERE r.book_id = book_rating_stats.book_id), 0), '
+        'rating_sum = COALESCE((SELECT SUM(r.rating) FROM reviews r WHERE r.book_id = book_rating_stats.book_id), 0), '
+        f'{histogram}'
+    )
+
+    # ETag 검증자로 쓰는 updated_at 을 마이크로초 단위로 (MySQL 만 해당)
+    if op.get_bind().dialect.name == 'mysql':
+        op.alter_column('book_rating_stats', 'updated_at',
+                   existing_type=mysql.DATETIME(),
+                   type_=mysql.DATETIME(fsp=6),
+                   existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'mysql':
+        op.alter_column('book_rating_stats', 'updated_at',
+                   existing_type=mysql.DATETIME(fsp=6),
+                   type_=mysql.DATETIME(),
+                   existing_nullable=True)
+    op.drop_index('ix_book_rating_stats_count', table_name='book_rating_stats')
+    op.drop_index('ix_book_rating_stats_avg', table_name='book_rating_stats')
+    with op.batch_alter_table('book_rating_stats') as batch_op:
+        batch_op.drop_column('rating_avg')
+        for name in reversed(RATING_COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,36 @@
+"""books fulltext index
+
+Revision ID: 7b2e4c91d0a3
+Revises: 3cc515dcc99e
+Create Date: 2026-10-18 10:12:04.118520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c91d0a3'
+down_revision: Union[str, Sequence[str], None] = '3cc515dcc99e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FULLTEXT 인덱스는 MySQL 에서만 생성 (SQLite 등은 앱 내부 역색인 사용)
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.create_index(
+        'ft_books_title_author_summary', 'books', ['title', 'author', 'summary'],
+        unique=False, mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_books_title_author_summary', table_name='books')
@@ -0,0 +1,46 @@
+"""book stock table and order stock reservations
+
+Revision ID: 9d3f1b7c2a84
+Revises: 5e8a0f37b6d2
+Create Date: 2026-10-18 15:02:44.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f1b7c2a84'
+down_revision: Union[str, Sequence[str], None] = '5e8a0f37b6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 기존 도서의 초기 재고 (이전에는 주문 한 건당 100권까지 항상 허용했음)
+INITIAL_STOCK = 100
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('book_stocks',
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.book_id'], ),
+    sa.PrimaryKeyConstraint('book_id')
+    )
+    op.execute(
+        sa.text('INSERT INTO book_stocks (book_id, stock, updated_at) SELECT book_id, :stock, CURRENT_TIMESTAMP FROM books')
+        .bindparams(stock=INITIAL_STOCK)
+    )
+
+    op.add_column('orders', sa.Column('reserved_until', sa.DateTime(), nullable=True))
+    op.create_index('ix_orders_status_reserved_until', 'orders', ['status', 'reserved_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_status_reserved_until', table_name='orders')
+    op.drop_column('orders', 'reserved_until')
+    op.drop_table('book_stocks')
@@ -0,0 +1,71 @@
+"""indexes for router query filters and sorts
+
+Revision ID: a8d4e2f7c315
+Revises: 6f1c3a9e8b27
+Create Date: 2026-10-18 19:05:21.417380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e2f7c315'
+down_revision: Union[str, Sequence[str], None] = '6f1c3a9e8b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 테이블, 컬럼, unique) - 라우터 쿼리의 WHERE 동등 조건 -> ORDER BY 순서
+INDEXES = [
+    ('ix_books_created_at', 'books', ['created_at', 'book_id'], False),
+    ('ix_books_updated_at', 'books', ['updated_at', 'book_id'], False),
+    ('ix_books_price', 'books', ['price', 'book_id'], False),
+    ('ix_books_title', 'books', ['title', 'book_id'], False),
+    ('ix_books_author', 'books', ['author', 'book_id'], False),
+    ('ix_books_publisher', 'books', ['publisher', 'book_id'], False),
+    ('ix_reviews_book_created', 'reviews', ['book_id', 'created_at', 'review_id'], False),
+    ('ix_reviews_user_id', 'reviews', ['user_id'], False),
+    ('ix_orders_user_created', 'orders', ['user_id', 'created_at', 'order_id'], False),
+    ('ix_order_items_order_book', 'order_items', ['order_id', 'book_id'], False),
+    ('ix_carts_user_id', 'carts', ['user_id'], False),
+    ('uq_cart_items_cart_book', 'cart_items', ['cart_id', 'book_id'], True),
+    ('uq_wishlists_user_book', 'wishlists', ['user_id', 'book_id'], True),
+    ('ix_token_blocklist_created_at', 'token_blocklist', ['created_at'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unique 인덱스를 만들기 전에 중복 행 정리
+    # (MySQL 은 수정 중인 테이블을 서브쿼리에서 바로 읽을 수 없어서 파생 테이블로 한 번 감쌈)
+    # 장바구니: 같은 도서 항목은 수량을 합쳐서 가장 먼저 담은 행 하나만 남김
+    op.execute(
+        'UPDATE cart_items SET quantity = ('
+        ' SELECT total FROM (SELECT cart_id, book_id, SUM(quantity) AS total FROM cart_items GROUP BY cart_id, book_id) t'
+        ' WHERE t.cart_id = cart_items.cart_id AND t.book_id = cart_items.book_id'
+        ') WHERE cart_item_id IN ('
+        ' SELECT keep_id FROM (SELECT MIN(cart_item_id) AS keep_id FROM cart_items GROUP BY cart_id, book_id HAVING COUNT(*) > 1) k'
+        ')'
+    )
+    op.execute(
+        'DELETE FROM cart_items WHERE cart_item_id NOT IN ('
+        ' SELECT keep_id FROM (SELECT MIN(cart_item_id) AS keep_id FROM cart_items GROUP BY cart_id, book_id) k'
+        ')'
+    )
+    # 위시리스트: 먼저 추가한 행만 남김
+    op.execute(
+        'DELETE FROM wishlists WHERE wishlist_id NOT IN ('
+        ' SELECT keep_id FROM (SELECT MIN(wishlist_id) AS keep_id FROM wishlists GROUP BY user_id, book_id) k'
+        ')'
+    )
+
+    for name, table, columns, unique in INDEXES:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""books updated_at microsecond precision
+
+Revision ID: c41d9e2a6f58
+Revises: 7b2e4c91d0a3
+Create Date: 2026-10-18 11:02:47.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d9e2a6f58'
+down_revision: Union[str, Sequence[str], None] = '7b2e4c91d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ETag 검증자로 쓰는 updated_at 을 마이크로초 단위로 (MySQL 만 해당, SQLite 는 문자열 저장)
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.alter_column('books', 'updated_at',
+               existing_type=mysql.DATETIME(),
+               type_=mysql.DATETIME(fsp=6),
+               existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.alter_column('books', 'updated_at',
+               existing_type=mysql.DATETIME(fsp=6),
+               type_=mysql.DATETIME(),
+               existing_nullable=True)
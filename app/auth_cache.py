@@ -0,0 +1,45 @@
+# app/auth_cache.py
+# get_current_user 인증 캐시 (토큰 해시 기준, 워커별 메모리)
+# 토큰 -> 사용자 컬럼 스냅샷 (짧은 TTL, 로그아웃/탈퇴/정보 변경 시 무효화)
+# (로그아웃 여부 확인은 app/blocklist.py)
+import hashlib
+from typing import Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.cache import TTLCache
+from app.config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS
+from app.models import User
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+principal_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+# 1. 캐시된 사용자 복원 (SQL 없이 현재 세션에 붙여서 반환 -> 수정 후 commit 도 그대로 동작)
+def load_principal(db: Session, token: str) -> Optional[User]:
+    snapshot = principal_cache.get(token_hash(token))
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+# 2. 사용자 스냅샷 저장 (user_id 태그로 사용자 단위 무효화 가능)
+def store_principal(token: str, user: User, ttl: float = None):
+    snapshot = {key: getattr(user, key) for key in _USER_COLUMNS}
+    ttl = AUTH_CACHE_TTL_SECONDS if ttl is None else min(ttl, AUTH_CACHE_TTL_SECONDS)
+    principal_cache.set(token_hash(token), snapshot, tags=[f"user:{user.user_id}"], ttl=ttl)
+
+
+# 3. 로그아웃: 해당 토큰의 캐시 제거
+def invalidate_token(token: str):
+    principal_cache.invalidate(token_hash(token))
+
+
+# 4. 탈퇴/정보 수정/권한 변경/삭제: 해당 사용자의 모든 토큰 캐시 제거
+def invalidate_user(user_id: int):
+    principal_cache.invalidate_tags(f"user:{user_id}")
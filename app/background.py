@@ -0,0 +1,22 @@
+# app/background.py
+# 주기적으로 실행되는 백그라운드 작업 (app/main.py lifespan 에서 시작/종료)
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+# interval 초마다 동기 함수 func 를 스레드풀에서 실행 (실패해도 다음 주기에 재시도)
+# 취소되면 (앱 종료) 실행 중인 작업은 스레드에서 끝날 때까지 기다린 뒤 종료 - 종료 처리 (마지막 flush, 엔진 dispose) 와 겹치지 않게
+async def run_periodic(name: str, interval: float, func):
+    while True:
+        await asyncio.sleep(interval)
+        job = asyncio.ensure_future(run_in_threadpool(func))
+        try:
+            await asyncio.shield(job)
+        except asyncio.CancelledError:
+            await asyncio.gather(job, return_exceptions=True)
+            raise
+        except Exception:
+            logger.exception(f"Background job failed: {name}")
@@ -0,0 +1,164 @@
+# app/blocklist.py
+# 로그아웃 토큰 블랙리스트
+# - DB: token_hash(sha256) + expires_at 만 저장, 만료된 행은 주기적으로 삭제
+# - 메모리: Bloom filter (시작 시 DB 에서 재구성) -> "로그아웃 안 된 토큰"은 DB 조회 없이 통과
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime
+from typing import Optional
+import jwt
+from sqlalchemy.orm import Session
+from app.auth_cache import token_hash, invalidate_token
+from app.cache import TTLCache
+from app.config import (
+    SECRET_KEY, ALGORITHM, AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS, AUTH_REVOKED_CACHE_TTL_SECONDS,
+    BLOCKLIST_BLOOM_CAPACITY, BLOCKLIST_BLOOM_ERROR_RATE,
+)
+from app.database import SessionLocal
+from app.models import TokenBlocklist
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """capacity 개를 넣었을 때 오탐률이 error_rate 가 되도록 비트 수/해시 수를 정하는 Bloom filter.
+    "없음"은 확실하고 "있음"은 확인이 필요하다 (삭제는 지원하지 않으므로 재구성으로 처리)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # double hashing: h1 + i * h2
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenBlocklistFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_until = None  # 마지막으로 반영한 created_at (증분 동기화 기준)
+        # Bloom filter 오탐/확정 결과 캐시 (차단됨은 길게, 오탐은 짧게)
+        self._confirmed = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+    # 1. 전체 재구성 (앱 시작 시, 만료 행 삭제 후)
+    def rebuild(self, db: Session):
+        now = datetime.utcnow()
+        rows = db.query(TokenBlocklist.token_hash, TokenBlocklist.created_at).filter(TokenBlocklist.expires_at > now).all()
+        bloom = BloomFilter(max(BLOCKLIST_BLOOM_CAPACITY, len(rows) * 2), BLOCKLIST_BLOOM_ERROR_RATE)
+        for row in rows:
+            bloom.add(row.token_hash)
+        with self._lock:
+            self._bloom = bloom
+            self._synced_until = max((row.created_at for row in rows if row.created_at), default=None)
+        logger.info(f"Token blocklist bloom filter rebuilt: {len(rows)} tokens")
+
+    # 2. 증분 동기화 (다른 워커에서 로그아웃된 토큰 반영)
+    def sync(self, db: Session):
+        if self._bloom is None:
+            return self.rebuild(db)
+        query = db.query(TokenBlocklist.token_hash, TokenBlocklist.created_at)
+        if self._synced_until is not None:
+            query = query.filter(TokenBlocklist.created_at >= self._synced_until)
+        rows = query.all()
+        with self._lock:
+            for row in rows:
+                self._bloom.add(row.token_hash)
+                if row.created_at and (self._synced_until is None or row.created_at > self._synced_until):
+                    self._synced_until = row.created_at
+
+    # 3. 만료된 토큰 삭제 (삭제된 게 있으면 Bloom filter 도 다시 만듦)
+    def prune(self, db: Session) -> int:
+        deleted = db.query(TokenBlocklist).filter(TokenBlocklist.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            self.rebuild(db)
+        return deleted
+
+    # 4. 로그아웃된 토큰인지 확인
+    def is_revoked(self, db: Session, token: str) -> bool:
+        if self._bloom is None:
+            self.rebuild(db)
+        key = token_hash(token)
+        if key not in self._bloom:
+            return False  # 대부분의 요청은 여기서 끝 (DB 조회 없음)
+
+        revoked = self._confirmed.get(key)
+        if revoked is None:
+            revoked = db.query(TokenBlocklist.token_hash).filter(TokenBlocklist.token_hash == key).first() is not None
+            self._confirmed.set(key, revoked, ttl=AUTH_REVOKED_CACHE_TTL_SECONDS if revoked else None)
+        return revoked
+
+    # 5. 로그아웃 처리 (토큰 만료 시각까지만 보관)
+    def revoke(self, db: Session, token: str, expires_at: datetime):
+        key = token_hash(token)
+        db.merge(TokenBlocklist(token_hash=key, expires_at=expires_at))
+        db.commit()
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(key)
+        self._confirmed.set(key, True, ttl=AUTH_REVOKED_CACHE_TTL_SECONDS)
+        invalidate_token(token)
+
+    def stats(self) -> dict:
+        bloom = self._bloom
+        return {
+            "loaded": bloom is not None,
+            "tokens": bloom.count if bloom else 0,
+            "bits": bloom.num_bits if bloom else 0,
+            "hashes": bloom.num_hashes if bloom else 0,
+        }
+
+
+token_blocklist = TokenBlocklistFilter()
+
+
+# 토큰의 만료 시각 (서명이 맞지 않는 토큰이면 None)
+def token_expires_at(token: str) -> Optional[datetime]:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False})
+    except jwt.PyJWTError:
+        return None
+    exp = payload.get("exp")
+    return datetime.utcfromtimestamp(exp) if exp else None
+
+
+# --- 주기 작업 (app/main.py lifespan 에서 실행) ---
+def warm_up_blocklist():
+    db = SessionLocal()
+    try:
+        token_blocklist.rebuild(db)
+    finally:
+        db.close()
+
+def sync_blocklist():
+    db = SessionLocal()
+    try:
+        token_blocklist.sync(db)
+    finally:
+        db.close()
+
+def prune_blocklist():
+    db = SessionLocal()
+    try:
+        deleted = token_blocklist.prune(db)
+        if deleted:
+            logger.info(f"Pruned {deleted} expired blocklist tokens")
+    finally:
+        db.close()
@@ -0,0 +1,100 @@
+# app/cache.py
+# 프로세스 내 TTL + LRU 캐시 (워커마다 따로 가짐)
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from app.config import BOOK_CACHE_MAX_ENTRIES, BOOK_CACHE_TTL_SECONDS
+
+
+class TTLCache:
+    """최대 max_entries 개를 유지하는 LRU 캐시. 각 항목은 ttl 초 후 만료된다.
+    항목마다 태그를 붙여두면 invalidate_tags() 로 관련 항목만 골라서 지울 수 있다."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()      # key -> (expires_at, value, tags)
+        self._tag_index = defaultdict(set)  # tag -> {key}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _drop(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=(), ttl: float = None):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, value, frozenset(tags))
+            for tag in tags:
+                self._tag_index[tag].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_tags(self, *tags):
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tag_index.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# 공개 도서 목록/상세 응답 캐시 (관리자 도서 등록/수정/삭제 시 무효화)
+book_cache = TTLCache(BOOK_CACHE_MAX_ENTRIES, BOOK_CACHE_TTL_SECONDS)
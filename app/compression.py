@@ -0,0 +1,146 @@
+# app/compression.py
+# 응답 압축 (gzip / brotli, 순수 ASGI 미들웨어)
+# - Accept-Encoding (q 값 포함) 으로 인코딩 선택: br > gzip (brotli 패키지가 없으면 gzip 만)
+# - COMPRESSION_MINIMUM_SIZE 보다 작은 본문, 에러 응답 (4xx/5xx 에러 envelope), 304/204, JSON/텍스트가 아닌 응답은 그대로
+# - 압축한 응답은 Content-Encoding + Vary: Accept-Encoding, ETag 는 weak 로 바꿈 (표현이 달라지므로.
+#   If-None-Match 비교는 W/ 를 무시하므로 304 는 그대로 동작)
+# - 스트리밍 응답 (more_body) 은 조각마다 압축해서 flush
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from app.config import COMPRESSION_MINIMUM_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (없으면 gzip 만 사용)
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+# 1. Accept-Encoding 파싱 -> 사용할 인코딩 (없으면 None)
+def negotiate_encoding(accept_encoding: str, brotli_enabled: bool = True) -> Optional[str]:
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+
+    available = (["br"] if brotli_enabled and brotli is not None else []) + ["gzip"]
+    # 명시된 q 값이 높은 순, 같으면 br 우선 ("*" 는 명시되지 않은 인코딩에 적용)
+    candidates = [(qualities.get(coding, qualities.get("*", 0.0)), coding) for coding in available]
+    q, coding = max(candidates, key=lambda item: item[0])
+    return coding if q > 0 else None
+
+
+# 2. 인코딩별 압축기 (compress(chunk) / flush() / finish() 가 bytes 를 돌려줌)
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush() if self._brotli else self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self._brotli else self._zlib.flush(zlib.Z_FINISH)
+
+
+# 본문 하나를 한 번에 압축 (미들웨어 / 벤치마크 공용)
+def compress(body: bytes, encoding: str, gzip_level: int = COMPRESSION_GZIP_LEVEL,
+             brotli_quality: int = COMPRESSION_BROTLI_QUALITY) -> bytes:
+    compressor = _Compressor(encoding, gzip_level, brotli_quality)
+    return compressor.compress(body) + compressor.finish()
+
+
+def _compressible(headers: Headers, status: int) -> bool:
+    if status < 200 or status >= 400 or status in (204, 304):
+        return False
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(EXCLUDED_TYPES)
+
+
+class CompressionMiddleware:
+    """http.response.start 를 첫 본문 조각이 올 때까지 미뤘다가 압축 여부를 정한다 (본문 크기를 알아야 하므로)."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE, gzip_level: int = COMPRESSION_GZIP_LEVEL,
+                 brotli_quality: int = COMPRESSION_BROTLI_QUALITY, brotli_enabled: bool = True):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.brotli_enabled)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None  # 압축 중이면 _Compressor, 그대로 보내기로 했으면 False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(scope=start_message)
+                if not _compressible(headers, start_message["status"]) or (not more_body and len(body) < self.minimum_size):
+                    compressor = False
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+            elif compressor is False:
+                await send(message)
+                return
+
+            chunk = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -5,3 +5,67 @@ load_dotenv()
 # 임시 비밀키 (나중엔 .env로 옮기세요)
 SECRET_KEY = os.getenv("SECRET_KEY", "super_secret_key_1234")
 ALGORITHM = "HS256"
+
+# 공개 도서 목록/상세 응답 캐시 (0 이면 캐시 사용 안 함)
+BOOK_CACHE_MAX_ENTRIES = int(os.getenv("BOOK_CACHE_MAX_ENTRIES", "1024"))
+BOOK_CACHE_TTL_SECONDS = float(os.getenv("BOOK_CACHE_TTL_SECONDS", "60"))
+
+# 공개 도서 조회 응답의 Cache-Control 헤더 (CDN/브라우저 캐시 정책)
+BOOK_CACHE_CONTROL = os.getenv("BOOK_CACHE_CONTROL", "public, max-age=60")
+
+# get_current_user 인증 캐시 (토큰별 사용자 정보 / 로그아웃 여부)
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_REVOKED_CACHE_TTL_SECONDS = float(os.getenv("AUTH_REVOKED_CACHE_TTL_SECONDS", "3600"))
+
+# 로그아웃 토큰 블랙리스트 (Bloom filter 크기/오탐률, 동기화/만료 삭제 주기)
+BLOCKLIST_BLOOM_CAPACITY = int(os.getenv("BLOCKLIST_BLOOM_CAPACITY", "100000"))
+BLOCKLIST_BLOOM_ERROR_RATE = float(os.getenv("BLOCKLIST_BLOOM_ERROR_RATE", "0.001"))
+BLOCKLIST_SYNC_SECONDS = float(os.getenv("BLOCKLIST_SYNC_SECONDS", "10"))
+BLOCKLIST_PRUNE_SECONDS = float(os.getenv("BLOCKLIST_PRUNE_SECONDS", "3600"))
+
+# 비밀번호 해싱 (bcrypt cost, 전용 프로세스 수, 최대 대기 작업 수 - 0 이면 제한 없음)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
+
+# DB 커넥션 풀 (워커 수 x (pool_size + max_overflow) 가 MySQL max_connections 를 넘지 않게 설정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # MySQL wait_timeout 보다 짧게
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# 읽기 전용 복제본 (콤마로 구분, 비우면 모든 조회가 primary 로)
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+DB_REPLICA_MAX_FAILURES = int(os.getenv("DB_REPLICA_MAX_FAILURES", "3"))         # 연속 실패 시 제외
+DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "10"))    # 제외된 복제본 재확인 주기
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))  # 쓰기 후 primary 로 읽는 시간
+
+# 재고 확보 (PENDING 주문이 재고를 잡아두는 시간, 만료 주문 정리 주기)
+STOCK_RESERVATION_SECONDS = int(os.getenv("STOCK_RESERVATION_SECONDS", "900"))
+STOCK_RELEASE_SECONDS = float(os.getenv("STOCK_RELEASE_SECONDS", "60"))
+
+# 좋아요 write-behind (켜면 좋아요/취소를 메모리에 모았다가 주기적으로 한 번에 DB 반영)
+LIKE_WRITE_BEHIND = os.getenv("LIKE_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+LIKE_FLUSH_SECONDS = float(os.getenv("LIKE_FLUSH_SECONDS", "1"))
+LIKE_BUFFER_MAX_PENDING = int(os.getenv("LIKE_BUFFER_MAX_PENDING", "10000"))  # 이만큼 쌓이면 바로 flush
+
+# 요청 메트릭 (Prometheus text format, GET /metrics)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# 요청 로그 (기록 비율 0~1, 이보다 느린 요청은 항상 기록, 큐 + 별도 스레드로 출력)
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+REQUEST_LOG_SLOW_SECONDS = float(os.getenv("REQUEST_LOG_SLOW_SECONDS", "1.0"))
+REQUEST_LOG_ASYNC = os.getenv("REQUEST_LOG_ASYNC", "true").lower() in ("1", "true", "yes")
+
+# SQL 프로파일러 (요청별 쿼리 수/시간 Server-Timing 헤더, 같은 SQL 반복 시 N+1 경고) / 느린 쿼리 로그 (0 이면 끔)
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_SLOW_QUERY_SECONDS = float(os.getenv("SQL_SLOW_QUERY_SECONDS", "0.5"))
+
+# 응답 압축 (gzip / brotli). 이보다 작은 본문은 압축하지 않음 (바이트). gzip 레벨 1~9, brotli quality 0~11
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
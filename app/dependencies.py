@@ -4,8 +4,11 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models import User, TokenBlocklist
+from app.models import User
 from app.config import SECRET_KEY, ALGORITHM
+from app.auth_cache import load_principal, store_principal
+from app.blocklist import token_blocklist
+import time
 
 # Swagger에서 'Bearer 토큰'을 직접 입력받도록 설정
 security = HTTPBearer()
@@ -13,8 +16,8 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
     token = credentials.credentials  # Bearer 부분을 제외한 토큰 값만 가져옴
     
-    is_blocked = db.query(TokenBlocklist).filter(TokenBlocklist.token == token).first()
-    if is_blocked:
+    # 로그아웃 여부 / 사용자 정보는 캐시에 있으면 DB 조회 생략
+    if token_blocklist.is_revoked(db, token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="로그아웃되었습니다다. 다시 로그인해주세요.",
@@ -35,6 +38,10 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     except jwt.PyJWTError:
         raise credentials_exception
     
+    user = load_principal(db, token)
+    if user is not None:
+        return user
+
     # DB에서 유저 찾기
     user = db.query(User).filter(User.email == email).first()
     if user is None:
@@ -46,4 +53,6 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="탈퇴한 회원입니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # 토큰 만료 시각을 넘겨서 캐시하지 않음
+    store_principal(token, user, ttl=payload.get("exp", 0) - time.time())
     return user
\ No newline at end of file
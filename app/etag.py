@@ -0,0 +1,26 @@
+# app/etag.py
+# ETag / If-None-Match (조건부 GET) 유틸
+import hashlib
+from fastapi import Request, Response
+
+
+# 1. 검증자 값들로 strong ETag 생성
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+# 2. 요청의 If-None-Match 와 비교 (GET 은 weak 비교 허용: W/ 접두어 무시)
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+# 3. 본문 없는 304 응답 (직렬화 생략)
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
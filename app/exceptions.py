@@ -1,5 +1,5 @@
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from app.responses import FastJSONResponse
 from datetime import datetime
 from fastapi.exceptions import RequestValidationError
 from app.error_codes import ErrorCode
@@ -17,7 +17,7 @@ class CustomException(Exception):
             self.status_code = getattr(error_code, "status_code", 400)
 
 def create_error_response(status_code: int, code: str, message: str, path: str, details: dict = None):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status_code,
         content={
             "timestamp": datetime.now().isoformat(),
@@ -0,0 +1,115 @@
+# app/inventory.py
+# 도서 재고 (book_stocks)
+# - 차감: UPDATE ... SET stock = stock - n WHERE stock >= n (조건부 원자적 차감, 재고가 음수가 되지 않음)
+# - 여러 도서는 UPDATE 한 문장으로, book_id(PK) 오름차순으로 행을 잠그므로 주문끼리 교착(deadlock)이 생기지 않음
+# - PENDING 주문은 reserved_until 까지 재고를 잡아두고, 지나면 주기 작업이 주문 취소 + 재고 복구
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+from app.config import STOCK_RESERVATION_SECONDS
+from app.database import SessionLocal
+from app.error_codes import ErrorCode
+from app.exceptions import CustomException
+from app.models import BookStock, Order, OrderItem, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 정리할 만료 주문 수
+RELEASE_BATCH_SIZE = 500
+
+
+# 주문 항목 -> {book_id: 합계 수량} (같은 도서가 여러 번 들어와도 한 번에 차감)
+def aggregate_quantities(items) -> dict[int, int]:
+    quantities = defaultdict(int)
+    for item in items:
+        if item.quantity <= 0:
+            raise CustomException(ErrorCode.INVALID_INPUT_VALUE)
+        quantities[item.book_id] += item.quantity
+    return dict(sorted(quantities.items()))
+
+
+def reservation_deadline() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=STOCK_RESERVATION_SECONDS)
+
+
+# 재고 차감 (하나라도 부족하면 OUT_OF_STOCK - 호출한 쪽 트랜잭션을 롤백해야 함)
+def reserve_stock(db: Session, quantities: dict[int, int]):
+    if not quantities:
+        return
+    amount = case(quantities, value=BookStock.book_id)
+    result = db.execute(
+        update(BookStock)
+        .where(BookStock.book_id.in_(list(quantities)), BookStock.stock >= amount)
+        .values(stock=BookStock.stock - amount)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(quantities):
+        raise CustomException(ErrorCode.OUT_OF_STOCK)
+
+
+# 주문에 포함된 수량만큼 재고 복구 (order_items 를 상관 서브쿼리로 합산해서 한 문장으로)
+def release_stock(db: Session, order_id: int):
+    ordered = (
+        select(func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id == order_id, OrderItem.book_id == BookStock.book_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(BookStock)
+        .where(BookStock.book_id.in_(select(OrderItem.book_id).where(OrderItem.order_id == order_id)))
+        .values(stock=BookStock.stock + ordered)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# 주문 취소 + 재고 복구. 상태 조건부 UPDATE 로 한 요청만 성공하므로 재고가 두 번 복구되지 않음
+# expired_before 를 주면 그 시각 전에 확보가 만료된 PENDING 주문만 취소
+def cancel_order(db: Session, order_id: int, expired_before: Optional[datetime] = None) -> bool:
+    query = update(Order).where(Order.order_id == order_id)
+    if expired_before is None:
+        query = query.where(Order.status != OrderStatus.CANCELLED)
+    else:
+        query = query.where(Order.status == OrderStatus.PENDING, Order.reserved_until < expired_before)
+    result = db.execute(
+        query.values(status=OrderStatus.CANCELLED, reserved_until=None).execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    release_stock(db, order_id)
+    return True
+
+
+# 결제 완료: 재고 확보 만료 해제 (만료 정리 작업이 먼저 취소했다면 False)
+def confirm_order(db: Session, order_id: int, status: OrderStatus) -> bool:
+    result = db.execute(
+        update(Order)
+        .where(Order.order_id == order_id, Order.status != OrderStatus.CANCELLED)
+        .values(status=status, reserved_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+# 주기 작업: 확보 시간이 지난 PENDING 주문 취소 + 재고 복구 (주문마다 커밋)
+def release_expired_reservations():
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        expired = db.scalars(
+            select(Order.order_id)
+            .where(Order.status == OrderStatus.PENDING, Order.reserved_until < now)
+            .limit(RELEASE_BATCH_SIZE)
+        ).all()
+        released = 0
+        for order_id in expired:
+            if cancel_order(db, order_id, expired_before=now):
+                released += 1
+            db.commit()
+        if released:
+            logger.info(f"Released stock of {released} expired orders")
+        return released
+    finally:
+        db.close()
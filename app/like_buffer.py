@@ -0,0 +1,143 @@
+# app/like_buffer.py
+# 좋아요 write-behind 버퍼 (LIKE_WRITE_BEHIND=true 일 때만 사용)
+# - 좋아요/취소를 요청마다 DB 에 쓰지 않고 (review_id, user_id) 별로 메모리에 모아둠
+#   (눌렀다 취소하면 서로 상쇄되어 DB 에는 아무것도 쓰지 않음)
+# - LIKE_FLUSH_SECONDS 마다, 또는 LIKE_BUFFER_MAX_PENDING 개가 쌓이면 리뷰별로 묶어서 한 트랜잭션으로 반영
+# - 응답의 좋아요 수 = DB 값 + 아직 반영되지 않은 증감 (워커마다 버퍼가 따로라 약간의 오차 가능)
+# - 종료 시(lifespan) 남은 내용을 반드시 flush
+import logging
+import threading
+from collections import defaultdict
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+from app.config import LIKE_WRITE_BEHIND, LIKE_BUFFER_MAX_PENDING
+from app.database import SessionLocal, insert_ignore
+from app.error_codes import ErrorCode
+from app.exceptions import CustomException
+from app.models import Review, ReviewLike
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """(review_id, user_id) -> 원하는 최종 상태(True=좋아요, False=취소) 를 DB 와 다른 것만 보관한다."""
+
+    def __init__(self, enabled: bool, max_pending: int):
+        self.enabled = enabled
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}                 # 아직 flush 하지 않은 변경
+        self._inflight = {}                # flush 중인 변경 (커밋 전까지 상태 판단에 포함)
+        self._deltas = defaultdict(int)    # review_id -> pending + inflight 증감 합계
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+
+    def _liked_in_db(self, db: Session, review_id: int, user_id: int) -> bool:
+        return db.get(ReviewLike, (review_id, user_id)) is not None
+
+    def _toggle(self, db: Session, review_id: int, user_id: int, like: bool) -> int:
+        likes = db.scalar(select(Review.likes).where(Review.review_id == review_id))
+        if likes is None:
+            raise CustomException(ErrorCode.RESOURCE_NOT_FOUND)
+        liked_in_db = self._liked_in_db(db, review_id, user_id)
+        key = (review_id, user_id)
+        with self._lock:
+            current = self._pending.get(key, self._inflight.get(key, liked_in_db))
+            if current == like:
+                raise CustomException(ErrorCode.ALREADY_EXISTS if like else ErrorCode.RESOURCE_NOT_FOUND)
+            # 버퍼에 반대 상태가 있으면 상쇄, 없으면 새 변경으로 기록
+            if key in self._pending:
+                del self._pending[key]
+            else:
+                self._pending[key] = like
+            self._deltas[review_id] += 1 if like else -1
+            count = max(likes + self._deltas[review_id], 0)
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+        return count
+
+    def like(self, db: Session, review_id: int, user_id: int) -> int:
+        return self._toggle(db, review_id, user_id, True)
+
+    def unlike(self, db: Session, review_id: int, user_id: int) -> int:
+        return self._toggle(db, review_id, user_id, False)
+
+    # 모인 변경을 리뷰별로 INSERT IGNORE / DELETE 후, 실제로 바뀐 행 수만큼 likes 증감 (한 번에 커밋)
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, {}
+                batch = self._inflight
+
+            adds, removes = defaultdict(list), defaultdict(list)
+            for (review_id, user_id), like in batch.items():
+                (adds if like else removes)[review_id].append(user_id)
+
+            db = SessionLocal()
+            try:
+                for review_id in sorted(set(adds) | set(removes)):
+                    added = insert_ignore(db, ReviewLike, [{"review_id": review_id, "user_id": u} for u in adds[review_id]])
+                    removed = 0
+                    if removes[review_id]:
+                        removed = db.execute(
+                            delete(ReviewLike).where(
+                                ReviewLike.review_id == review_id, ReviewLike.user_id.in_(removes[review_id])
+                            )
+                        ).rowcount
+                    if added != removed:
+                        db.execute(
+                            update(Review).where(Review.review_id == review_id)
+                            .values(likes=Review.likes + (added - removed))
+                            .execution_options(synchronize_session=False)
+                        )
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.failures += 1
+                logger.exception("Like buffer flush failed, keeping changes for the next flush")
+                self._requeue(batch)
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                for (review_id, _), like in batch.items():
+                    self._deltas[review_id] -= 1 if like else -1
+                    if not self._deltas[review_id]:
+                        del self._deltas[review_id]
+                self._inflight = {}
+            self.flushes += 1
+            self.flushed_rows += len(batch)
+            return len(batch)
+
+    # flush 실패 시 다시 pending 으로 (그 사이 반대로 바뀐 항목은 서로 상쇄, 증감 합계는 그대로)
+    def _requeue(self, batch: dict):
+        with self._lock:
+            for key, like in batch.items():
+                if key in self._pending:
+                    del self._pending[key]
+                else:
+                    self._pending[key] = like
+            self._inflight = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "flushed_rows": self.flushed_rows,
+                "failures": self.failures,
+            }
+
+
+like_buffer = LikeBuffer(enabled=LIKE_WRITE_BEHIND, max_pending=LIKE_BUFFER_MAX_PENDING)
+
+
+def flush_likes():
+    like_buffer.flush()
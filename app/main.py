@@ -1,12 +1,10 @@
 # app/main.py
 from fastapi import FastAPI, HTTPException, Request
-from .database import engine
+from .database import engine, async_engine, replica_set, check_replicas, QueryProfilerMiddleware
 from . import models
 from .routers import auth, users, books, reviews, carts, orders, wishlists, likes, stats
 from .exceptions import global_exception_handler, custom_exception_handler, CustomException, validation_exception_handler, python_exception_handler
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
-import time
 import logging
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -20,6 +18,18 @@ from pydantic import Field
 from fastapi import Depends
 from app.error_codes import ErrorCode
 from datetime import datetime
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
+import asyncio
+from app.background import run_periodic
+from app.blocklist import warm_up_blocklist, sync_blocklist, prune_blocklist
+from app.password_hasher import password_hasher
+from app.config import BLOCKLIST_SYNC_SECONDS, BLOCKLIST_PRUNE_SECONDS, DB_REPLICA_CHECK_SECONDS, STOCK_RELEASE_SECONDS, LIKE_FLUSH_SECONDS, METRICS_ENABLED, REQUEST_LOG_ASYNC, SQL_PROFILER_ENABLED, COMPRESSION_ENABLED
+from app.inventory import release_expired_reservations
+from app.like_buffer import like_buffer, flush_likes
+from app.metrics import MetricsMiddleware, metrics_endpoint
+from app.request_logging import RequestLoggingMiddleware, start_async_access_log, stop_async_access_log
+from app.compression import CompressionMiddleware
 class ErrorResponse(BaseModel):
     timestamp: str = Field(..., example="2025-12-14T12:00:00Z")
     path: str = Field(..., example="/api/request/url")
@@ -193,11 +203,46 @@ global_responses = {
 }
 models.Base.metadata.create_all(bind=engine)
 limiter = Limiter(key_func=get_remote_address)
+
+# 앱 시작/종료 시 처리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청 로그 출력 스레드 (큐 + 별도 스레드)
+    access_log_listener = start_async_access_log() if REQUEST_LOG_ASYNC else None
+    # 로그아웃 토큰 Bloom filter 적재 + 주기 작업 (다른 워커 로그아웃 반영, 만료 토큰 삭제)
+    await run_in_threadpool(warm_up_blocklist)
+    tasks = [
+        asyncio.create_task(run_periodic("blocklist-sync", BLOCKLIST_SYNC_SECONDS, sync_blocklist)),
+        asyncio.create_task(run_periodic("blocklist-prune", BLOCKLIST_PRUNE_SECONDS, prune_blocklist)),
+    ]
+    # 결제 없이 재고 확보 시간이 지난 주문 취소 + 재고 복구
+    tasks.append(asyncio.create_task(run_periodic("stock-release", STOCK_RELEASE_SECONDS, release_expired_reservations)))
+    # 좋아요 write-behind 버퍼 주기 반영
+    if like_buffer.enabled:
+        tasks.append(asyncio.create_task(run_periodic("like-flush", LIKE_FLUSH_SECONDS, flush_likes)))
+    # 제외된 읽기 복제본 복귀 확인
+    if replica_set.replicas:
+        tasks.append(asyncio.create_task(run_periodic("replica-check", DB_REPLICA_CHECK_SECONDS, check_replicas)))
+    yield
+    for task in tasks:
+        task.cancel()
+    # 취소한 작업이 끝날 때까지 대기 (스레드풀에서 실행 중인 작업은 끝난 뒤에 취소되므로, 아래 flush/dispose 와 겹치지 않게)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # 종료 전에 버퍼에 남은 좋아요 반영
+    if like_buffer.enabled:
+        await run_in_threadpool(flush_likes)
+    password_hasher.shutdown()
+    if access_log_listener is not None:
+        stop_async_access_log(access_log_listener)
+    await async_engine.dispose()
+    await replica_set.dispose()
+
 app = FastAPI(
     title="Bookstore API",
     version="1.0.0",
     description="과제 2 백엔드 API 서버",
-    responses=global_responses
+    responses=global_responses,
+    lifespan=lifespan
 )
 app.state.limiter = limiter
 
@@ -243,25 +288,19 @@ def health_check(db: Session = Depends(get_db)):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # 요청 로그
-        logger.info(f"REQ: {request.method} {request.url.path}")
-        
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            
-            # 응답 로그
-            logger.info(
-                f"RES: {response.status_code} | Time: {process_time:.4f}s"
-            )
-            return response
-        except Exception as e:
-            # 에러 로그 (스택 트레이스)
-            logger.error(f"ERROR: {str(e)}", exc_info=True)
-            raise e
+# 응답 압축 (gzip/brotli). 가장 안쪽에 두어서 요청 로그/메트릭의 처리 시간에 압축 시간도 포함
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# 요청 로그 (순수 ASGI, REQUEST_LOG_ASYNC 면 출력은 lifespan 에서 시작한 큐 + 별도 스레드)
+app.add_middleware(RequestLoggingMiddleware)
+
+# 요청별 SQL 프로파일러 (Server-Timing 헤더, N+1 경고)
+if SQL_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
 
-app.add_middleware(LoggingMiddleware)
\ No newline at end of file
+# 요청 메트릭 (가장 바깥에서 측정) + Prometheus 수집 엔드포인트
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    # APIRoute 로 등록해야 scope["route"] 가 채워져서 수집 요청도 "/metrics" 라벨로 집계됨 (Starlette Route 는 unmatched)
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
\ No newline at end of file
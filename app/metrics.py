@@ -0,0 +1,254 @@
+# app/metrics.py
+# 간단한 메트릭 자료구조 (스레드 안전) + Prometheus text format 출력 (GET /metrics)
+# - 요청 메트릭: 라우트별 (URL 이 아니라 "/api/public/books/{book_id}" 같은 경로 템플릿) 지연 시간 히스토그램,
+#   상태 코드별 요청 수, 처리 중인 요청 수, 요청당 DB 쿼리 수
+# - 순수 ASGI 미들웨어에서 숫자만 더함 (요청마다 로그 문자열을 만들지 않음, 워커마다 따로 집계)
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar, Token
+from typing import Optional
+from starlette.requests import Request
+from starlette.responses import Response
+
+# 기본 지연시간 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 요청당 SQL 문 수 버킷
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 라우트에 매칭되지 않은 요청 (404 스캔 등) 은 하나로 묶어서 라벨 종류가 늘어나지 않게 함
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """관측값을 고정 버킷(le = 이하)에 누적하는 히스토그램."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)  # value <= bound 인 첫 버킷
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+            return {"buckets": cumulative, "count": self._count, "sum": round(self._sum, 6)}
+
+
+class Counter:
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge(Counter):
+    def dec(self, amount: int = 1):
+        self.inc(-amount)
+
+
+# --- Prometheus 출력 ---
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricFamily:
+    """같은 이름의 메트릭을 라벨 값별로 묶음. labels(...) 로 라벨 값에 해당하는 Counter/Gauge/Histogram 을 얻는다."""
+
+    def __init__(self, kind: str, name: str, documentation: str, labelnames=(), factory=None):
+        self.kind = kind  # counter | gauge | histogram
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    # 이미 있는 메트릭 객체를 그대로 노출 (예: 커넥션 풀 메트릭)
+    def add(self, child, *values):
+        with self._lock:
+            self._children[values] = child
+        return self
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_labels(self.labelnames, values)} {child.value}")
+                continue
+            snapshot = child.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {snapshot['sum']}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {snapshot['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._families = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> MetricFamily:
+        return self._register(MetricFamily("counter", name, documentation, labelnames, Counter))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> MetricFamily:
+        return self._register(MetricFamily("gauge", name, documentation, labelnames, Gauge))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> MetricFamily:
+        return self._register(MetricFamily("histogram", name, documentation, labelnames, lambda: Histogram(buckets)))
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        self._families.append(family)
+        return family
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status"))
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route"))
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being processed", ("method",))
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("method", "route"), QUERY_COUNT_BUCKETS)
+
+
+# --- 요청별 SQL 집계 (요청 메트릭 / SQL 프로파일러 공용) ---
+# 요청마다 바깥쪽 미들웨어가 QueryProfile 하나를 contextvar 로 넣고, app.database 의 엔진 이벤트
+# (모든 엔진의 before/after_cursor_execute 한 쌍) 가 기록함
+# (동기 엔드포인트의 스레드풀, AsyncSession 의 greenlet 모두 요청의 context 를 이어받음)
+class QueryProfile:
+    """한 요청에서 실행된 SQL 집계 (파라미터가 달라도 SQL 문이 같으면 같은 쿼리로 셈)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.statements = defaultdict(int)  # SQL 문 -> 실행 횟수
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    # threshold 번 이상 반복된 SQL 문 (N+1 의심), 많이 반복된 순
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return sorted(
+            ((statement, times) for statement, times in self.statements.items() if times >= threshold),
+            key=lambda item: item[1], reverse=True,
+        )
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_time * 1000:.2f}"
+        )
+
+
+query_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+# 현재 요청의 QueryProfile (바깥 미들웨어가 이미 넣었으면 같이 씀) -> (profile, 새로 넣었을 때만 reset 용 token)
+def use_query_profile() -> tuple[QueryProfile, Optional[Token]]:
+    profile = query_profile.get()
+    if profile is not None:
+        return profile, None
+    profile = QueryProfile()
+    return profile, query_profile.set(profile)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """순수 ASGI 미들웨어 (BaseHTTPMiddleware 처럼 응답을 별도 태스크/스트림으로 감싸지 않음).
+    라우트 템플릿은 라우팅이 끝난 뒤 scope["route"] 에 채워지므로 응답이 끝난 다음에 기록한다."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500  # 응답을 시작하기 전에 예외가 나면 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile, token = use_query_profile()
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            if token is not None:
+                query_profile.reset(token)
+            route = route_template(scope)
+            http_requests_total.labels(method, route, status).inc()
+            http_request_duration_seconds.labels(method, route).observe(elapsed)
+            db_queries_per_request.labels(method, route).observe(profile.count)
+
+
+# GET /metrics (Prometheus 수집용)
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(registry.render(), media_type=CONTENT_TYPE)
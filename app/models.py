@@ -1,10 +1,33 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, DECIMAL, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, DECIMAL, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects import mysql
 import enum
 from .database import Base
 
+
+# --- 마이크로초 단위 시각 (ETag 검증자로 쓰는 updated_at 이 같은 초 안의 수정도 구분하도록) ---
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+class precise_now(FunctionElement):
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(precise_now)
+def _precise_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(precise_now, "mysql")
+def _precise_now_mysql(element, compiler, **kw):
+    return "NOW(6)"
+
+@compiles(precise_now, "sqlite")
+def _precise_now_sqlite(element, compiler, **kw):
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
 # --- Enums ---
 class UserRole(str, enum.Enum):
     USER = "USER"
@@ -47,12 +70,36 @@ class Book(Base):
     summary = Column(Text, nullable=True)
     price = Column(DECIMAL(10, 2), nullable=False)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(PreciseDateTime, default=precise_now(), onupdate=precise_now())
 
     # Relationships
     # [수정] categories 관계 삭제됨
     authors = relationship("Author", secondary="book_authors", back_populates="books")
     reviews = relationship("Review", back_populates="book")
+    stock = relationship("BookStock", uselist=False, cascade="all, delete-orphan")
+    rating_stats = relationship("BookRatingStats", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # 목록 정렬 (정렬 컬럼 + book_id tiebreaker 순서 그대로 읽고 LIMIT 에서 멈춤, 커서 조건도 인덱스 범위)
+        Index("ix_books_created_at", "created_at", "book_id"),
+        Index("ix_books_updated_at", "updated_at", "book_id"),
+        Index("ix_books_price", "price", "book_id"),
+        Index("ix_books_title", "title", "book_id"),
+        Index("ix_books_author", "author", "book_id"),
+        Index("ix_books_publisher", "publisher", "book_id"),
+        # 제목/저자/요약 전문 검색 (MySQL 전용, ngram 파서로 한글 부분 일치 지원)
+        Index(
+            "ft_books_title_author_summary", "title", "author", "summary",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+    )
+
+# 도서 재고 (주문이 몰리는 재고 행을 books 와 분리해서 목록/상세 캐시에 영향이 없도록 함)
+class BookStock(Base):
+    __tablename__ = "book_stocks"
+    book_id = Column(Integer, ForeignKey("books.book_id"), primary_key=True)
+    stock = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 class Author(Base):
     __tablename__ = "authors"
@@ -87,6 +134,41 @@ class Review(Base):
     user = relationship("User", back_populates="reviews")
     book = relationship("Book", back_populates="reviews")
 
+    __table_args__ = (
+        # 도서별 리뷰 목록 (WHERE book_id = ? ORDER BY created_at DESC, review_id DESC + 커서)
+        Index("ix_reviews_book_created", "book_id", "created_at", "review_id"),
+        # 내 리뷰 목록
+        Index("ix_reviews_user_id", "user_id"),
+    )
+
+# 도서별 리뷰 집계 (리뷰 작성/수정/삭제 시 증감으로 유지)
+# 리뷰 목록의 totalCount, 도서 평점 표시, 평점/리뷰 수 정렬(인덱스 사용)에 사용
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+class BookRatingStats(Base):
+    __tablename__ = "book_rating_stats"
+    book_id = Column(Integer, ForeignKey("books.book_id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    # 평점별 리뷰 수 (히스토그램)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    rating_avg = Column(DECIMAL(3, 2), nullable=False, default=0)  # 리뷰가 없으면 0 (정렬/커서에서 NULL 비교를 피함)
+    updated_at = Column(PreciseDateTime, default=precise_now(), onupdate=precise_now())
+
+    __table_args__ = (
+        # 평점순/리뷰 많은 순 도서 목록
+        Index("ix_book_rating_stats_avg", "rating_avg", "book_id"),
+        Index("ix_book_rating_stats_count", "review_count", "book_id"),
+    )
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        return {str(r): getattr(self, f"rating_{r}") or 0 for r in RATING_VALUES}
+
 class ReviewLike(Base):
     __tablename__ = "review_likes"
     review_id = Column(Integer, ForeignKey("reviews.review_id"), primary_key=True)
@@ -104,6 +186,11 @@ class Wishlist(Base):
     user = relationship("User", back_populates="wishlist")
     book = relationship("Book")
 
+    __table_args__ = (
+        # 내 위시리스트 조회 + 중복 추가 방지
+        Index("uq_wishlists_user_book", "user_id", "book_id", unique=True),
+    )
+
 class Cart(Base):
     __tablename__ = "carts"
     cart_id = Column(Integer, primary_key=True, index=True)
@@ -113,6 +200,10 @@ class Cart(Base):
     user = relationship("User", back_populates="cart")
     items = relationship("CartItem", back_populates="cart")
 
+    __table_args__ = (
+        Index("ix_carts_user_id", "user_id"),
+    )
+
 class CartItem(Base):
     __tablename__ = "cart_items"
     cart_item_id = Column(Integer, primary_key=True, index=True)
@@ -124,18 +215,31 @@ class CartItem(Base):
     cart = relationship("Cart", back_populates="items")
     book = relationship("Book")
 
+    __table_args__ = (
+        # 장바구니 항목 조회 + 같은 도서는 한 행 (담을 때 수량만 증가)
+        Index("uq_cart_items_cart_book", "cart_id", "book_id", unique=True),
+    )
+
 class Order(Base):
     __tablename__ = "orders"
     order_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     total_amount = Column(DECIMAL(10, 2), nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING)
+    reserved_until = Column(DateTime, nullable=True)  # PENDING 주문의 재고 확보 만료 시각 (UTC)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     user = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order")
 
+    __table_args__ = (
+        # 만료된 재고 확보(PENDING) 주문 검색용
+        Index("ix_orders_status_reserved_until", "status", "reserved_until"),
+        # 내 주문 목록 (WHERE user_id = ? ORDER BY created_at DESC, order_id DESC + 커서)
+        Index("ix_orders_user_created", "user_id", "created_at", "order_id"),
+    )
+
 class OrderItem(Base):
     __tablename__ = "order_items"
     order_item_id = Column(Integer, primary_key=True, index=True)
@@ -147,8 +251,14 @@ class OrderItem(Base):
     order = relationship("Order", back_populates="items")
     book = relationship("Book")
 
+    __table_args__ = (
+        # 주문별 항목 조회 (IN), 취소 시 재고 복구
+        Index("ix_order_items_order_book", "order_id", "book_id"),
+    )
+
 class TokenBlocklist(Base):
     __tablename__ = "token_blocklist"
     
-    token = Column(String(500), primary_key=True)
-    created_at = Column(DateTime, default=func.now())
\ No newline at end of file
+    token_hash = Column(String(64), primary_key=True)  # sha256(토큰)
+    expires_at = Column(DateTime, nullable=False, index=True)  # 토큰 만료 시각 (UTC), 지나면 삭제
+    created_at = Column(DateTime, default=func.now(), index=True)  # 주기 동기화 (created_at >= 마지막 동기화 시각)
\ No newline at end of file
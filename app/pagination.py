@@ -0,0 +1,93 @@
+# app/pagination.py
+# 커서(keyset) 페이지네이션 공통 유틸
+# 커서 = base64url(JSON [정렬키, 마지막 행의 정렬값, 마지막 행의 PK])
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import DateTime, and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from app.exceptions import CustomException
+from app.error_codes import ErrorCode
+
+
+def _to_json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json_value(column, raw):
+    if raw is None or column is None:
+        return raw
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is Decimal:
+        return Decimal(raw)
+    return python_type(raw)
+
+
+# SQLite 는 DATETIME 을 문자열로 저장해서 CURRENT_TIMESTAMP('... 12:00:00') 와
+# 바인딩 값('... 12:00:00.000000') 의 형식이 달라 같은 시각도 다르게 비교됨
+# -> SQLite 에서만 양쪽을 같은 형식으로 맞춰서 비교 (MySQL 은 컬럼 그대로 = 인덱스 사용)
+class comparable_datetime(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, expr):
+        super().__init__(expr)
+        self.type = expr.type
+
+
+@compiles(comparable_datetime)
+def _comparable_datetime_default(element, compiler, **kw):
+    return compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(comparable_datetime, "sqlite")
+def _comparable_datetime_sqlite(element, compiler, **kw):
+    return "STRFTIME('%%Y-%%m-%%d %%H:%%M:%%f', %s)" % compiler.process(list(element.clauses)[0], **kw)
+
+
+# 1. 커서 생성 (정렬키 + 정렬값 + tiebreaker id)
+def encode_cursor(sort_key: str, value, row_id: int) -> str:
+    raw = json.dumps([sort_key, _to_json_value(value), row_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+# 2. 커서 해석 (다른 정렬로 만든 커서거나 깨진 값이면 400)
+# column 을 넘기면 해당 컬럼 타입으로 값을 복원 (None 이면 JSON 값 그대로)
+def decode_cursor(cursor: str, sort_key: str, column):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, raw_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if key != sort_key:
+            raise ValueError("sort mismatch")
+        return _from_json_value(column, raw_value), int(row_id)
+    except (ValueError, TypeError, binascii.Error, ArithmeticError):
+        raise CustomException(ErrorCode.INVALID_INPUT_VALUE)
+
+
+# 3. "마지막 행 다음"에 해당하는 WHERE 조건
+# (column, id) 복합 정렬 기준으로 이어서 조회하므로 OFFSET 없이 인덱스만 타고 내려감
+# NULL은 ASC에서 맨 앞, DESC에서 맨 뒤에 온다고 가정 (MySQL/SQLite 공통)
+def keyset_filter(column, id_column, value, row_id: int, descending: bool):
+    if isinstance(getattr(column, "type", None), DateTime):
+        if value is not None:
+            value = comparable_datetime(literal(value, column.type))
+        column = comparable_datetime(column)
+    if descending:
+        if value is None:
+            return and_(column.is_(None), id_column < row_id)
+        return or_(
+            column < value,
+            and_(column == value, id_column < row_id),
+            column.is_(None),
+        )
+    if value is None:
+        return or_(column.isnot(None), and_(column.is_(None), id_column > row_id))
+    return or_(column > value, and_(column == value, id_column > row_id))
@@ -0,0 +1,75 @@
+# app/password_hasher.py
+# bcrypt 해싱/검증 전용 프로세스 풀
+# CPU 를 오래 쓰는 bcrypt 가 다른 API 들이 함께 쓰는 스레드풀/이벤트 루프를 막지 않도록 분리
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from app.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+from app.error_codes import ErrorCode
+from app.exceptions import CustomException
+from app.utils import get_password_hash, verify_and_update_password
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self.in_flight = 0       # 실행 중 + 대기 중인 작업 수
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        # workers 가 0 이면 기본 스레드풀 사용 (프로세스를 띄울 수 없는 환경용)
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # fork 대신 spawn: 스레드가 떠 있는 서버 프로세스를 복제하지 않도록
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        # 대기열이 가득 차면 429 (로그인 폭주가 서버 전체 지연으로 번지지 않게)
+        if self.max_queue and self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise CustomException(ErrorCode.TOO_MANY_REQUESTS)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - max(self.workers, 1))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    # (일치 여부, cost 설정이 바뀌었을 때의 새 해시 또는 None)
+    async def verify(self, password: str, hashed: str):
+        return await self._run(verify_and_update_password, password, hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
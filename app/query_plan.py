@@ -0,0 +1,46 @@
+# app/query_plan.py
+# 실행 계획(EXPLAIN) 검사 - 쿼리가 인덱스 없이 테이블 전체를 읽는지 확인 (테스트/점검용)
+# - SQLite: EXPLAIN QUERY PLAN 의 "SCAN <table>" (USING INDEX 없음) = 전체 스캔
+# - MySQL: EXPLAIN 의 type = ALL = 전체 스캔
+#   (MySQL 은 행 수가 적으면 인덱스가 있어도 ALL 을 고를 수 있으므로 데이터가 충분한 DB 에서 확인)
+# 사용: with capture_queries(engine) as queries: ... 요청 실행 ... -> full_scans(conn, *query)
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.database import Base
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS (\w+))?$")
+
+
+# statement 를 실행했을 때 전체 스캔하는 (모델에 정의된) 테이블 목록
+def full_scans(connection, statement: str, parameters=()) -> list[str]:
+    tables = Base.metadata.tables
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        matches = (_SQLITE_FULL_SCAN.match(row[-1]) for row in rows)
+        scanned = [match.group(1) for match in matches if match]
+    elif dialect == "mysql":
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        scanned = [row["table"] for row in rows if row["type"] == "ALL"]
+    else:
+        raise NotImplementedError(f"EXPLAIN not supported for {dialect}")
+    return [name for name in scanned if name in tables]
+
+
+# 블록 안에서 실행된 SELECT 문과 파라미터를 모아 둠 (동기/비동기 엔진은 sync_engine 을 넘김)
+@contextmanager
+def capture_queries(*engines):
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,76 @@
+# app/rating_stats.py
+# 도서별 리뷰 집계 (book_rating_stats: 리뷰 수, 평점 합계, 평점별 히스토그램, 평균)
+# - 리뷰 작성/수정/삭제와 같은 트랜잭션에서 UPDATE ... = 값 + 증감 으로 반영 (전체 리뷰를 다시 세지 않음)
+# - 행이 없으면 INSERT IGNORE 로 먼저 만들어서 동시에 첫 리뷰가 달려도 중복 INSERT 오류가 나지 않음
+# - 평균은 같은 UPDATE 에서 계산해서 저장 (평점순 정렬이 인덱스만 타도록)
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.database import insert_ignore
+from app.error_codes import ErrorCode
+from app.exceptions import CustomException
+from app.models import Book, BookRatingStats, Review, RATING_VALUES
+
+
+def validate_rating(rating: int):
+    if rating not in RATING_VALUES:
+        raise CustomException(ErrorCode.INVALID_INPUT_VALUE)
+
+
+def _average(rating_sum, review_count):
+    return func.coalesce(func.round(rating_sum * 1.0 / func.nullif(review_count, 0), 2), 0)
+
+
+def _apply(db: Session, book_id: int, count_delta: int, sum_delta: int, histogram_delta: dict[int, int]):
+    insert_ignore(db, BookRatingStats, [{"book_id": book_id}])
+    stats = BookRatingStats
+    # MySQL 은 SET 절을 왼쪽부터 적용하고 뒤 식에서 바뀐 값을 보므로, 평균을 맨 앞에 두고
+    # 두 DB 모두 기존 값 + 증감으로 계산되게 함
+    values = [
+        (stats.rating_avg, _average(stats.rating_sum + sum_delta, stats.review_count + count_delta)),
+        (stats.review_count, stats.review_count + count_delta),
+        (stats.rating_sum, stats.rating_sum + sum_delta),
+    ]
+    for rating, delta in histogram_delta.items():
+        if delta:
+            column = getattr(stats, f"rating_{rating}")
+            values.append((column, column + delta))
+    db.execute(
+        update(stats)
+        .where(stats.book_id == book_id)
+        .ordered_values(*values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_review_stats(db: Session, book_id: int, rating: int):
+    _apply(db, book_id, 1, rating, {rating: 1})
+
+
+def change_review_stats(db: Session, book_id: int, old_rating: int, new_rating: int):
+    if old_rating != new_rating:
+        _apply(db, book_id, 0, new_rating - old_rating, {old_rating: -1, new_rating: 1})
+
+
+def remove_review_stats(db: Session, book_id: int, rating: int):
+    _apply(db, book_id, -1, -rating, {rating: -1})
+
+
+# 전체 재계산 (초기 데이터 적재 후 등 - 모든 도서에 대해 reviews 를 GROUP BY 해서 다시 채움)
+def rebuild_rating_stats(db: Session):
+    counts = [func.sum(case((Review.rating == r, 1), else_=0)) for r in RATING_VALUES]
+    db.execute(delete(BookRatingStats))
+    db.execute(
+        insert(BookRatingStats).from_select(
+            ["book_id", "review_count", "rating_sum"] + [f"rating_{r}" for r in RATING_VALUES] + ["rating_avg", "updated_at"],
+            select(
+                Book.book_id,
+                func.count(Review.review_id),
+                func.coalesce(func.sum(Review.rating), 0),
+                *[func.coalesce(c, 0) for c in counts],
+                func.coalesce(func.round(func.avg(Review.rating), 2), 0),
+                func.now(),
+            )
+            .outerjoin(Review, Review.book_id == Book.book_id)
+            .group_by(Book.book_id),
+        )
+    )
@@ -0,0 +1,81 @@
+# app/request_logging.py
+# 요청 로그 (순수 ASGI 미들웨어)
+# - 요청당 한 줄 (메서드, 경로, 상태 코드, 처리 시간). 메시지는 % 인자로 넘겨서 실제로 출력할 때만 문자열을 만듦
+# - REQUEST_LOG_SAMPLE_RATE 비율만 기록 (5xx/예외/느린 요청은 항상 기록)
+# - REQUEST_LOG_ASYNC=true 면 QueueHandler 로 큐에 넣기만 하고, 출력(stdout/파일 쓰기)은 별도 스레드(QueueListener)가 처리
+import logging
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from app.config import REQUEST_LOG_SAMPLE_RATE, REQUEST_LOG_SLOW_SECONDS
+
+access_logger = logging.getLogger("app.access")
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """같은 프로세스의 리스너 스레드로만 넘기므로 prepare() 에서 미리 포맷하지 않음 (포맷도 리스너 스레드에서)."""
+
+    def prepare(self, record):
+        return record
+
+
+# 요청 로그를 큐 + 리스너 스레드로 출력 (root 로거의 핸들러를 그대로 사용). 앱 lifespan 에서 시작/종료
+def start_async_access_log() -> QueueListener:
+    log_queue = queue.SimpleQueue()
+    handlers = logging.getLogger().handlers or [logging.StreamHandler()]
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    access_logger.addHandler(_InProcessQueueHandler(log_queue))
+    access_logger.propagate = False
+    listener.start()
+    return listener
+
+
+# 큐 핸들러를 먼저 떼서 이후 로그는 root 핸들러로 바로 출력 (읽는 스레드가 없는 큐에 쌓이지 않게), 남은 로그 출력 후 스레드 종료
+def stop_async_access_log(listener: QueueListener):
+    for handler in list(access_logger.handlers):
+        if isinstance(handler, _InProcessQueueHandler):
+            access_logger.removeHandler(handler)
+    access_logger.propagate = True
+    listener.stop()
+
+
+class RequestLoggingMiddleware:
+    """BaseHTTPMiddleware 와 달리 응답을 별도 태스크/메모리 스트림으로 감싸지 않고 send 만 감싼다 (스트리밍 응답도 그대로 전달)."""
+
+    def __init__(self, app, sample_rate: float = REQUEST_LOG_SAMPLE_RATE, slow_seconds: float = REQUEST_LOG_SLOW_SECONDS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            # 에러 로그 (스택 트레이스) 는 샘플링하지 않음
+            access_logger.error("%s %s failed after %.1fms", scope["method"], scope["path"],
+                                (time.perf_counter() - start) * 1000, exc_info=True)
+            raise
+        elapsed = time.perf_counter() - start
+        if self._should_log(status, elapsed):
+            access_logger.info("%s %s %d %.1fms", scope["method"], scope["path"], status, elapsed * 1000)
+
+    def _should_log(self, status: int, elapsed: float) -> bool:
+        if not access_logger.isEnabledFor(logging.INFO):
+            return False
+        if status >= 500 or elapsed >= self.slow_seconds:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
@@ -0,0 +1,42 @@
+# app/responses.py
+# JSON 응답 직렬화
+# - FastJSONResponse: response_model 이 없는 라우트 / 에러 응답처럼 dict 를 그대로 돌려주는 경우 orjson 으로 직렬화
+#   (orjson 이 없으면 표준 json 으로 동작). response_model 이 있는 라우트는 FastAPI 가 pydantic(Rust) 으로 직접 직렬화하므로 해당 없음
+# - model_response: 이미 DTO 로 만든 응답 모델 (APIResponse[...]) 을 response_model 재검증 없이 바로 JSON 바이트로
+#   FastAPI 는 엔드포인트 반환값을 response_model 로 한 번 더 검증한 뒤 직렬화하는데, 도서 목록처럼 큰 응답에서는 이 재검증이
+#   직렬화만큼 비쌈 (benchmarks/serialization.py 참고)
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse 와 같은 출력 (UTF-8, 공백 없음) 을 orjson 으로 만든다."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# 1. 이미 직렬화된 JSON 바이트 (캐시에 저장해 둔 응답 본문 등)
+def json_response(body: bytes, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+# 2. 검증된 DTO 로 만든 응답 모델을 그대로 직렬화
+# - 엔드포인트에서 Response 를 반환하면 FastAPI 는 response_model 검증/직렬화를 건너뜀
+#   (대신 주입받은 response 에 넣은 헤더는 합쳐지지 않으므로 헤더는 여기로 넘김)
+# - 타입이 지정된 모델 (APIResponse[BookListResponse]) 을 넘겨야 스키마 기반으로 빠르게 직렬화됨
+def dump_json(model: BaseModel) -> bytes:
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    return json_response(dump_json(model), status_code, headers)
@@ -3,28 +3,25 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserLogin, APIResponse, Token
-from app.utils import get_password_hash, verify_password, create_access_token
+from app.utils import create_access_token
+from app.password_hasher import password_hasher
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.models import TokenBlocklist
 import jwt
 from pydantic import BaseModel
 from app.exceptions import CustomException
 from app.error_codes import ErrorCode
 from app.config import SECRET_KEY, ALGORITHM
+from app.blocklist import token_blocklist, token_expires_at
 
 router = APIRouter()
 
-# 1. 회원가입 API
-@router.post("/api/signup", response_model=APIResponse, summary="회원가입")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    # 이메일 중복 체크
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        return APIResponse(isSuccess=False, message="이미 존재하는 이메일입니다.")
-    
-    # 사용자 생성
-    hashed_password = get_password_hash(user.password)
+# DB 작업은 스레드풀에서 (bcrypt 는 password_hasher 프로세스 풀에서 실행)
+def _find_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _create_user(db: Session, user: UserCreate, hashed_password: str):
     new_user = User(
         email=user.email,
         password=hashed_password,
@@ -34,6 +31,23 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    return new_user
+
+def _update_password_hash(db: Session, user: User, hashed_password: str):
+    user.password = hashed_password
+    db.commit()
+
+# 1. 회원가입 API
+@router.post("/api/signup", response_model=APIResponse, summary="회원가입")
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
+    # 이메일 중복 체크
+    db_user = await run_in_threadpool(_find_user_by_email, db, user.email)
+    if db_user:
+        return APIResponse(isSuccess=False, message="이미 존재하는 이메일입니다.")
+    
+    # 사용자 생성
+    hashed_password = await password_hasher.hash(user.password)
+    new_user = await run_in_threadpool(_create_user, db, user, hashed_password)
     
     return APIResponse(
         isSuccess=True, 
@@ -43,11 +57,18 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
 
 # 2. 로그인 API
 @router.post("/api/auth/login", response_model=APIResponse, summary="로그인")
-def login(user_req: UserLogin, db: Session = Depends(get_db)):
+async def login(user_req: UserLogin, db: Session = Depends(get_db)):
     # 사용자 확인
-    user = db.query(User).filter(User.email == user_req.email).first()
-    if not user or not verify_password(user_req.password, user.password):
+    user = await run_in_threadpool(_find_user_by_email, db, user_req.email)
+    if not user:
+        raise CustomException(ErrorCode.LOGIN_FAILED)
+    valid, new_hash = await password_hasher.verify(user_req.password, user.password)
+    if not valid:
         raise CustomException(ErrorCode.LOGIN_FAILED)
+
+    # BCRYPT_ROUNDS 가 바뀌었으면 새 cost 로 다시 저장
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, db, user, new_hash)
     
     # 토큰 발급
     access_token = create_access_token(data={"sub": user.email}, expires_delta=timedelta(minutes=30))
@@ -78,14 +99,13 @@ def logout(
     token = credentials.credentials # Bearer 뒤의 토큰 값만 추출
     
     # 이미 블랙리스트에 있는지 확인 (중복 방지)
-    exists = db.query(TokenBlocklist).filter(TokenBlocklist.token == token).first()
-    if exists:
+    if token_blocklist.is_revoked(db, token):
          return APIResponse(isSuccess=True, message="이미 로그아웃된 토큰입니다.")
 
-    # 블랙리스트에 추가
-    blocked_token = TokenBlocklist(token=token)
-    db.add(blocked_token)
-    db.commit()
+    # 블랙리스트에 추가 (토큰 만료 시각까지만 보관, 서명이 틀린 토큰은 어차피 사용 불가라 저장 안 함)
+    expires_at = token_expires_at(token)
+    if expires_at is not None:
+        token_blocklist.revoke(db, token, expires_at)
     
     return APIResponse(isSuccess=True, message="로그아웃 되었습니다.")
 
@@ -106,7 +126,7 @@ def refresh_token(
             raise CustomException(ErrorCode.INVALID_TOKEN)
             
         # 블랙리스트 체크 (선택 사항이지만 보안상 권장)
-        if db.query(TokenBlocklist).filter(TokenBlocklist.token == req.refreshToken).first():
+        if token_blocklist.is_revoked(db, req.refreshToken):
              raise CustomException(ErrorCode.LOGOUT_TOKEN)
 
     except jwt.PyJWTError:
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from app.database import get_db
-from app.models import Book, User, UserRole
-from app.schemas import APIResponse, BookCreate, BookDto, BookListResponse
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, asc, func, select
+from app.database import get_db, get_async_read_db
+from app.models import Book, BookRatingStats, BookStock, User, UserRole
+from app.schemas import APIResponse, BookCreate, BookDto, BookListResponse, Pagination
 from app.dependencies import get_current_user
+from app.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.search import book_search_index, fulltext_available, fulltext_relevance
+from app.cache import book_cache
+from app.etag import make_etag, etag_matches, not_modified
+from app.config import BOOK_CACHE_CONTROL
+from app.responses import json_response, dump_json
+from typing import Optional
 import math
-from app.schemas import BookCreate
 
 router = APIRouter()
 
@@ -26,70 +33,235 @@ def create_book(
         author=book_req.author,
         publisher=book_req.publisher,
         summary=book_req.summary,
-        price=book_req.price
+        price=book_req.price,
+        stock=BookStock(stock=book_req.stock or 0),
+        rating_stats=BookRatingStats()
     )
     db.add(new_book)
     db.commit()
     db.refresh(new_book)
+    book_search_index.upsert(new_book)
+    book_cache.invalidate_tags("books:list")
 
     return APIResponse(isSuccess=True, message="도서 등록 성공", payload={"book_id": new_book.book_id})
 
+# 정렬 허용 필드 (목록에 없는 필드는 기본값 created_at 으로 처리)
+SORT_FIELDS = {
+    "book_id": Book.book_id,
+    "title": Book.title,
+    "author": Book.author,
+    "publisher": Book.publisher,
+    "price": Book.price,
+    "created_at": Book.created_at,
+    "updated_at": Book.updated_at,
+    # 리뷰 집계 (book_rating_stats 인덱스로 정렬)
+    "rating": BookRatingStats.rating_avg,
+    "review_count": BookRatingStats.review_count,
+}
+RATING_SORT_FIELDS = {"rating", "review_count"}
+
+# 도서 + 리뷰 집계를 JOIN 한 번으로 (평점 정렬일 때는 모든 도서에 집계 행이 있으므로 INNER JOIN)
+def _select_books(sort_field):
+    query = select(Book)
+    if sort_field in RATING_SORT_FIELDS:
+        query = query.join(Book.rating_stats)
+    else:
+        query = query.outerjoin(Book.rating_stats)
+    return query.options(contains_eager(Book.rating_stats))
+
+def parse_sort(sort: str, search: str = None):
+    field, _, direction = (sort or "").partition(",")
+    # 관련도순(match)은 검색어가 있을 때만 의미가 있고 항상 내림차순
+    if field == "match" and search:
+        return field, True
+    if field not in SORT_FIELDS:
+        field = "created_at"
+    descending = direction.strip().lower() != "asc"
+    return field, descending
+
+# 역색인 검색 결과 중 이번 페이지 구간 [(book_id, score)] (다음 페이지 확인용으로 size + 1 개)
+def _ranked_window(ranked, page, size, cursor, sort_key):
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, sort_key, None)
+        start = next(
+            (i for i, (book_id, score) in enumerate(ranked) if (score, book_id) < (last_score, last_id)),
+            len(ranked),
+        )
+    else:
+        start = (page - 1) * size
+    return ranked[start:start + size + 1]
+
+# 목록 ETag: 페이지에 포함된 도서(+다음 페이지 첫 도서)와 그 중 가장 최근 updated_at(도서/리뷰 집계), 전체 개수
+def _list_etag(cache_key, rows, total_count):
+    ids = [row[0] for row in rows]
+    last_modified = max((value for row in rows for value in row[1:] if value is not None), default=None)
+    return make_etag(cache_key, ids, last_modified, total_count)
+
+# ETag 검증자: (book_id, 도서 updated_at, 리뷰 집계 updated_at)
+def _validator(book):
+    return book.book_id, book.updated_at, book.rating_stats.updated_at if book.rating_stats else None
+
+# 캐시에는 직렬화된 응답 본문을 저장 (캐시 히트 시 검증/직렬화 없이 그대로 전송)
+def _cached_response(body: bytes, etag: str):
+    return json_response(body, headers={"ETag": etag, "Cache-Control": BOOK_CACHE_CONTROL})
+
 # 2. 도서 목록 조회 (누구나 가능 - 검색/정렬/페이징) 
+# - page 모드: 기존과 동일하게 page/size 로 조회 (OFFSET)
+# - cursor 모드: 이전 응답의 nextCursor 를 넘기면 OFFSET 없이 이어서 조회
+#   (페이지 깊이와 상관없이 일정한 속도, totalCount 는 withCount=true 일 때만 계산)
+# - search: 제목/저자/요약 전문 검색, sort=match 이면 관련도순
+# - If-None-Match 가 맞으면 (book_id, updated_at) 만 조회하고 304 응답
 @router.get("/api/public/books", response_model=APIResponse[BookListResponse])
-def get_books(
-    page: int = 1,
-    size: int = 10,
+async def get_books(
+    request: Request,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
     search: str = None,
-    sort: str = Query("created_at,desc", description="field,asc|desc"),
-    db: Session = Depends(get_db)
+    sort: str = Query("created_at,desc", description="field,asc|desc (rating = 평점순, review_count = 리뷰 많은 순, 검색 시 match = 관련도순)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    withCount: Optional[bool] = Query(None, description="전체 개수 계산 여부 (기본: page 모드만 계산)"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    query = db.query(Book)
+    # 캐시 키 정규화 (검색어 공백/대소문자, 정렬 기본값, cursor 모드의 page 무시)
+    search = " ".join(search.lower().split()) if search else None
+    if withCount is None:
+        withCount = cursor is None
+    sort_field, descending = parse_sort(sort, search)
+    sort_key = f"{sort_field},{'desc' if descending else 'asc'}"
+    cache_key = ("books", None if cursor else page, size, search, sort_key, cursor, withCount)
+    cached = book_cache.get(cache_key)
+    if cached is not None:
+        body, etag = cached
+        if etag_matches(request, etag):
+            return not_modified(etag, BOOK_CACHE_CONTROL)
+        return _cached_response(body, etag)
+
+    query = _select_books(sort_field)
 
-    # 검색 로직 (제목 또는 저자에 검색어가 포함되면)
+    # 검색 로직 (MySQL 은 FULLTEXT 인덱스, 그 외 DB 는 역색인 사용)
+    relevance = None  # MATCH ... AGAINST 관련도 점수
+    ranked = None     # 역색인 검색 결과 [(book_id, score)]
     if search:
-        query = query.filter(Book.title.contains(search) | Book.author.contains(search))
+        if fulltext_available(db):
+            relevance = fulltext_relevance(search)
+            query = query.where(relevance > 0)
+        else:
+            await book_search_index.ensure_built_async(db)
+            ranked = book_search_index.search(search)
+            query = query.where(Book.book_id.in_([book_id for book_id, _ in ranked]))
 
-    # 정렬 로직
-    sort_field, sort_dir = sort.split(",")
-    if sort_dir.lower() == "desc":
-        query = query.order_by(desc(getattr(Book, sort_field, Book.created_at)))
+    # 전체 개수는 필요할 때만 계산 (cursor 모드 기본값은 생략)
+    if not withCount:
+        total_count = None
+    elif ranked is not None:
+        total_count = len(ranked)
     else:
-        query = query.order_by(asc(getattr(Book, sort_field, Book.created_at)))
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    window = None
+    if sort_field == "match" and ranked is not None:
+        # 관련도 순위는 이미 메모리에 있으므로 해당 구간 도서만 IN 으로 조회
+        window = _ranked_window(ranked, page, size, cursor, sort_key)
+        query = _select_books(sort_field).where(Book.book_id.in_([book_id for book_id, _ in window]))
+    else:
+        # 정렬 로직 (동일 값일 때 순서가 보장되도록 book_id 를 tiebreaker 로 사용)
+        sort_column = relevance if sort_field == "match" else SORT_FIELDS[sort_field]
+        # 평점 정렬은 book_rating_stats 인덱스 (정렬값, book_id) 순서 그대로 읽도록 같은 테이블의 book_id 사용
+        id_column = BookRatingStats.book_id if sort_field in RATING_SORT_FIELDS else Book.book_id
+        if descending:
+            query = query.order_by(desc(sort_column), desc(id_column))
+        else:
+            query = query.order_by(asc(sort_column), asc(id_column))
+
+        # 페이지네이션 (다음 페이지 존재 여부 확인을 위해 size + 1 개 조회)
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, sort_key, sort_column)
+            query = query.where(keyset_filter(sort_column, id_column, last_value, last_id, descending))
+        else:
+            query = query.offset((page - 1) * size)
+        query = query.limit(size + 1)
 
-    # 페이지네이션 계산
-    total_count = query.count()
-    total_pages = math.ceil(total_count / size)
-    books = query.offset((page - 1) * size).limit(size).all()
+    # 조건부 요청이면 검증자 컬럼만 먼저 조회해서 변경이 없으면 304
+    if request.headers.get("if-none-match"):
+        validators = (await db.execute(
+            query.with_only_columns(Book.book_id, Book.updated_at, BookRatingStats.updated_at)
+        )).all()
+        if window is not None:
+            updated = {row[0]: tuple(row[1:]) for row in validators}
+            validators = [(book_id, *updated.get(book_id, ())) for book_id, _ in window]
+        etag = _list_etag(cache_key, validators, total_count)
+        if etag_matches(request, etag):
+            return not_modified(etag, BOOK_CACHE_CONTROL)
 
-    # Pydantic 모델로 변환
+    if window is not None:
+        books_by_id = {b.book_id: b for b in (await db.scalars(query)).all()}
+        rows = [(books_by_id[book_id], score) for book_id, score in window if book_id in books_by_id]
+    else:
+        rows = (await db.execute(query.add_columns(sort_column))).all()
+
+    books = [book for book, _ in rows[:size]]
+    next_cursor = None
+    if len(rows) > size:
+        last_book, last_value = rows[size - 1]
+        next_cursor = encode_cursor(sort_key, last_value, last_book.book_id)
+    etag = _list_etag(cache_key, [_validator(book) for book, _ in rows], total_count)
+
+    # Pydantic 모델로 변환 (타입이 지정된 응답 모델로 만들어서 response_model 재검증 없이 직렬화)
     book_dtos = [BookDto.model_validate(b) for b in books]
     
-    return APIResponse(
+    result = APIResponse[BookListResponse](
         isSuccess=True,
         message="도서 목록 조회 성공",
-        payload={
-            "content": book_dtos,
-            "pagination": {
-                "totalCount": total_count,
-                "page": page,
-                "size": size,
-                "totalPages": total_pages
-            }
-        }
+        payload=BookListResponse(
+            content=book_dtos,
+            pagination=Pagination(
+                totalCount=total_count,
+                page=None if cursor else page,
+                size=size,
+                totalPages=math.ceil(total_count / size) if total_count is not None else None
+            ),
+            nextCursor=next_cursor
+        )
     )
+    body = dump_json(result)
+
+    # 무효화용 태그: 포함된 도서, 정렬 필드, 검색 여부
+    tags = ["books:list", f"sort:{sort_field}"] + [f"book:{b.book_id}" for b in books]
+    if search:
+        tags.append("books:search")
+    book_cache.set(cache_key, (body, etag), tags=tags)
+    return _cached_response(body, etag)
 
 # 3. 도서 상세 조회 [cite: 548]
 @router.get("/api/public/books/{book_id}", response_model=APIResponse[BookDto])
-def get_book_detail(book_id: int, db: Session = Depends(get_db)):
-    book = db.query(Book).filter(Book.book_id == book_id).first()
-    if not book:
-        return APIResponse(isSuccess=False, message="도서를 찾을 수 없습니다.")
-    
-    dto = BookDto.model_validate(book)
-    if book.created_at:
-        dto.created_at = book.created_at.isoformat()
+async def get_book_detail(book_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    cached = book_cache.get(("book", book_id))
+    if cached is None and request.headers.get("if-none-match"):
+        # 조건부 요청: updated_at(도서/리뷰 집계) 만 조회해서 비교
+        validator = (await db.execute(
+            select(Book.book_id, Book.updated_at, BookRatingStats.updated_at)
+            .outerjoin(Book.rating_stats)
+            .where(Book.book_id == book_id)
+        )).first()
+        etag = make_etag("book", *validator) if validator else None
+        if validator is not None and etag_matches(request, etag):
+            return not_modified(etag, BOOK_CACHE_CONTROL)
 
-    return APIResponse(isSuccess=True, message="도서 상세 조회 성공", payload=dto)
+    if cached is not None:
+        body, etag = cached
+        if etag_matches(request, etag):
+            return not_modified(etag, BOOK_CACHE_CONTROL)
+    else:
+        book = await db.get(Book, book_id, options=[selectinload(Book.rating_stats)])
+        if not book:
+            return APIResponse(isSuccess=False, message="도서를 찾을 수 없습니다.")
+        
+        dto = BookDto.model_validate(book)
+        body = dump_json(APIResponse[BookDto](isSuccess=True, message="도서 상세 조회 성공", payload=dto))
+        etag = make_etag("book", *_validator(book))
+        book_cache.set(("book", book_id), (body, etag), tags=[f"book:{book_id}"])
+
+    return _cached_response(body, etag)
 
 @router.patch("/api/admin/books/{book_id}", response_model=APIResponse)
 def update_book(
@@ -105,14 +277,32 @@ def update_book(
     if not book:
         return APIResponse(isSuccess=False, message="도서를 찾을 수 없습니다.")
     
+    # 캐시 무효화 범위 계산용 (값이 바뀐 필드)
+    changed = {
+        field for field in ("title", "author", "publisher", "price", "summary")
+        if getattr(book, field) != getattr(book_req, field)
+    }
+
     # 필드 업데이트
     book.title = book_req.title
     book.author = book_req.author
     book.publisher = book_req.publisher
     book.price = book_req.price
     book.summary = book_req.summary
+    # 재고는 다른 주문과 겹치지 않도록 UPDATE 한 문장으로 설정
+    if book_req.stock is not None:
+        if book.stock is None:
+            book.stock = BookStock(stock=book_req.stock)
+        else:
+            db.query(BookStock).filter(BookStock.book_id == book_id).update({"stock": book_req.stock}, synchronize_session=False)
     
     db.commit()
+    book_search_index.upsert(book)
+    # 이 도서가 포함된 목록/상세 + 바뀐 필드로 정렬된 목록 + (검색 필드가 바뀌면) 검색 결과
+    tags = [f"book:{book_id}", "sort:updated_at"] + [f"sort:{field}" for field in changed]
+    if changed & {"title", "author", "summary"}:
+        tags.append("books:search")
+    book_cache.invalidate_tags(*tags)
     return APIResponse(isSuccess=True, message="도서 정보를 수정했습니다.")
 
 # [Admin] 5. 도서 삭제 (관리자 전용)
@@ -131,4 +321,6 @@ def delete_book(
     
     db.delete(book)
     db.commit()
+    book_search_index.remove(book_id)
+    book_cache.invalidate_tags(f"book:{book_id}", "books:list")
     return APIResponse(isSuccess=True, message="도서를 삭제했습니다.")
\ No newline at end of file
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
+from decimal import Decimal
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Cart, CartItem, Book, User
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select
+from app.database import get_db, get_async_db, upsert
+from app.models import Cart, CartItem, Book, User, Order, OrderItem, OrderStatus
+from app.inventory import aggregate_quantities, reserve_stock, reservation_deadline
 from app.schemas import APIResponse, CartItemCreate, CartItemDto, CartListResponse, CartItemUpdate
 from app.dependencies import get_current_user
+from app.responses import model_response
 router = APIRouter()
 
 # 1. 장바구니에 담기
@@ -21,61 +26,61 @@ def add_to_cart(
         db.commit()
         db.refresh(cart)
 
-    # 2. 이미 담긴 책인지 확인
-    existing_item = db.query(CartItem).filter(
-        CartItem.cart_id == cart.cart_id,
-        CartItem.book_id == item_req.book_id
-    ).first()
+    # 2. 도서 확인 (INSERT 가 외래 키를 검사하지 않는 DB 에서도 없는 도서는 담지 않음)
+    if db.get(Book, item_req.book_id) is None:
+        return APIResponse(isSuccess=False, message="도서를 찾을 수 없습니다.")
 
-    if existing_item:
-        # 이미 있으면 수량 추가
-        existing_item.quantity += item_req.quantity
-    else:
-        # 없으면 새로 추가
-        new_item = CartItem(
-            cart_id=cart.cart_id,
-            book_id=item_req.book_id,
-            quantity=item_req.quantity
-        )
-        db.add(new_item)
-    
+    # 3. 담기 - (cart_id, book_id) unique 인덱스에 걸리면 (이미 담았거나 동시 요청이 먼저 넣었으면) 수량만 증가
+    #    중복 키일 때만 UPDATE 하는 INSERT 한 문장 (다른 오류는 그대로 발생)
+    upsert(
+        db, CartItem,
+        {"cart_id": cart.cart_id, "book_id": item_req.book_id, "quantity": item_req.quantity},
+        ["cart_id", "book_id"],
+        {"quantity": CartItem.quantity + item_req.quantity},
+    )
     db.commit()
     return APIResponse(isSuccess=True, message="장바구니에 담았습니다.")
 
 # 2. 장바구니 조회
 @router.get("/api/carts", response_model=APIResponse[CartListResponse])
-def get_cart_items(
-    db: Session = Depends(get_db),
+async def get_cart_items(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.user_id).first()
-    if not cart:
+    # 장바구니 + 아이템 + 도서(제목/가격만)를 JOIN 한 번으로 조회
+    # (아이템이 없는 장바구니도 나오도록 OUTER JOIN)
+    rows = (await db.execute(
+        select(Cart.cart_id, CartItem.cart_item_id, CartItem.book_id, CartItem.quantity, Book.title, Book.price)
+        .select_from(Cart)
+        .outerjoin(CartItem, CartItem.cart_id == Cart.cart_id)
+        .outerjoin(Book, Book.book_id == CartItem.book_id)
+        .where(Cart.user_id == current_user.user_id)
+        .order_by(Cart.cart_id, CartItem.cart_item_id)
+    )).all()
+    if not rows:
         return APIResponse(isSuccess=True, message="장바구니가 비어있습니다.", payload={"cart_id": 0, "items": [], "total_price": 0})
 
-    # 아이템 목록 가져오기 (책 정보 포함)
-    cart_items = db.query(CartItem).filter(CartItem.cart_id == cart.cart_id).all()
-    
+    cart_id = rows[0].cart_id
     dtos = []
-    total_price = 0
-    for item in cart_items:
+    total_price = Decimal("0")  # 합계는 Decimal 로 계산 (float 누적 오차 방지)
+    for row in rows:
+        if row.cart_id != cart_id or row.cart_item_id is None:
+            continue
         dtos.append(CartItemDto(
-            cart_item_id=item.cart_item_id,
-            book_id=item.book_id,
-            book_title=item.book.title, # 관계형 데이터 접근
-            quantity=item.quantity,
-            price=float(item.book.price)
+            cart_item_id=row.cart_item_id,
+            book_id=row.book_id,
+            book_title=row.title,
+            quantity=row.quantity,
+            price=float(row.price)
         ))
-        total_price += (float(item.book.price) * item.quantity)
+        total_price += row.price * row.quantity
 
-    return APIResponse(
+    # 이미 만든 DTO 로 응답 모델을 구성했으므로 response_model 재검증 없이 직렬화
+    return model_response(APIResponse[CartListResponse](
         isSuccess=True,
         message="장바구니 조회 성공",
-        payload={
-            "cart_id": cart.cart_id,
-            "items": dtos,
-            "total_price": total_price
-        }
-    )
+        payload=CartListResponse(cart_id=cart_id, items=dtos, total_price=float(total_price))
+    ))
 
 # 3. 장바구니 아이템 삭제
 @router.delete("/api/carts/items/{cart_item_id}", response_model=APIResponse)
@@ -120,4 +125,60 @@ def update_cart_item_quantity(
         message = "수량을 변경했습니다."
         
     db.commit()
-    return APIResponse(isSuccess=True, message=message)
\ No newline at end of file
+    return APIResponse(isSuccess=True, message=message)
+
+# 5. 장바구니 주문 (장바구니에 담긴 상품으로 바로 주문 생성)
+# 상품 수와 상관없이 한 트랜잭션, 고정된 문장 수로 처리:
+# 장바구니 항목 SELECT ... FOR UPDATE -> 재고 차감 UPDATE -> 주문 INSERT -> 주문 상세 bulk INSERT -> 읽은 항목만 삭제
+# (주문 상세/합계/재고/삭제 모두 처음 잠가서 읽은 행 기준이므로, 그 사이에 담은 상품이 섞이거나 주문 없이 지워지지 않음)
+@router.post("/api/carts/checkout", response_model=APIResponse)
+def checkout_cart(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # 1. 장바구니 항목 + 가격 (항목 행을 잠가서 커밋 전까지 수정/삭제되지 않게)
+    rows = (
+        db.query(Cart.cart_id, CartItem.cart_item_id, CartItem.book_id, CartItem.quantity, Book.price)
+        .join(CartItem, CartItem.cart_id == Cart.cart_id)
+        .join(Book, Book.book_id == CartItem.book_id)
+        .filter(Cart.user_id == current_user.user_id)
+        .order_by(Cart.cart_id, CartItem.cart_item_id)
+        .with_for_update(of=CartItem)
+        .all()
+    )
+    if not rows:
+        return APIResponse(isSuccess=False, message="장바구니가 비어있습니다.")
+    cart_id = rows[0].cart_id
+    rows = [row for row in rows if row.cart_id == cart_id]
+
+    # 2. 수량 검증 (0 이하면 INVALID_INPUT_VALUE) + 재고 차감 (부족하면 OUT_OF_STOCK 으로 전체 롤백)
+    quantities = aggregate_quantities(rows)
+    reserve_stock(db, quantities)
+    total_amount = sum((row.price * row.quantity for row in rows), Decimal("0"))
+
+    # 3. 주문 저장
+    new_order = Order(
+        user_id=current_user.user_id,
+        total_amount=total_amount,
+        status=OrderStatus.PENDING,
+        reserved_until=reservation_deadline()
+    )
+    db.add(new_order)
+    db.flush()
+    order_id = new_order.order_id
+
+    # 4. 주문 상세는 위에서 읽은 항목 그대로 (한 번의 bulk INSERT)
+    db.execute(insert(OrderItem), [
+        {"order_id": order_id, "book_id": row.book_id, "quantity": row.quantity, "price": row.price}
+        for row in rows
+    ])
+
+    # 5. 주문한 항목만 장바구니에서 삭제 + 한 번에 커밋
+    db.execute(delete(CartItem).where(CartItem.cart_item_id.in_([row.cart_item_id for row in rows])))
+    db.commit()
+
+    return APIResponse(
+        isSuccess=True,
+        message="주문이 완료되었습니다.",
+        payload={"order_id": order_id, "total_amount": float(total_amount)}
+    )
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, insert_ignore
+from app.like_buffer import like_buffer
 from app.models import Review, ReviewLike, User
 from app.schemas import APIResponse
 from app.dependencies import get_current_user
@@ -9,28 +11,57 @@ from app.error_codes import ErrorCode
 from pydantic import BaseModel
 router = APIRouter()
 
+
+# 좋아요 수는 Python 에서 읽고 더하지 않고 UPDATE likes = likes + 1 로 DB 에서 원자적으로 변경
+# (동시에 눌러도 증가분이 사라지지 않음)
+def add_like(db: Session, review_id: int, user_id: int) -> int:
+    result = db.execute(
+        update(Review).where(Review.review_id == review_id)
+        .values(likes=Review.likes + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise CustomException(ErrorCode.RESOURCE_NOT_FOUND)
+    # (review_id, user_id) 복합 PK 로 중복 등록 방지
+    if not insert_ignore(db, ReviewLike, [{"review_id": review_id, "user_id": user_id}]):
+        db.rollback()
+        raise CustomException(ErrorCode.ALREADY_EXISTS)
+    likes = db.scalar(select(Review.likes).where(Review.review_id == review_id))
+    db.commit()
+    return likes
+
+
+# add_like 와 같은 순서 (reviews 행 -> review_likes) 로 잠가서 같은 리뷰에 좋아요/취소가 동시에 와도 교착되지 않게
+# (좋아요한 적이 없으면 롤백해서 감소분을 되돌림)
+def remove_like(db: Session, review_id: int, user_id: int) -> int:
+    db.execute(
+        update(Review).where(Review.review_id == review_id, Review.likes > 0)
+        .values(likes=Review.likes - 1)
+        .execution_options(synchronize_session=False)
+    )
+    result = db.execute(
+        delete(ReviewLike).where(ReviewLike.review_id == review_id, ReviewLike.user_id == user_id)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise CustomException(ErrorCode.RESOURCE_NOT_FOUND)
+    likes = db.scalar(select(Review.likes).where(Review.review_id == review_id))
+    db.commit()
+    return likes
+
+
 @router.post("/api/reviews/{review_id}/like", response_model=APIResponse)
 def like_review(
     review_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 이미 좋아요 했는지 확인
-    exists = db.query(ReviewLike).filter(
-        ReviewLike.review_id == review_id, 
-        ReviewLike.user_id == current_user.user_id
-    ).first()
-    
-    if exists:
-        raise CustomException(ErrorCode.ALREADY_EXISTS)
-    
-    # 좋아요 추가 및 카운트 증가
-    db.add(ReviewLike(review_id=review_id, user_id=current_user.user_id))
-    review = db.query(Review).filter(Review.review_id == review_id).first()
-    review.likes += 1
-    db.commit()
-    
-    return APIResponse(isSuccess=True, message="좋아요를 등록했습니다.", payload={"likes": review.likes})
+    if like_buffer.enabled:
+        likes = like_buffer.like(db, review_id, current_user.user_id)
+    else:
+        likes = add_like(db, review_id, current_user.user_id)
+    return APIResponse(isSuccess=True, message="좋아요를 등록했습니다.", payload={"likes": likes})
 
 @router.delete("/api/reviews/{review_id}/like", response_model=APIResponse)
 def unlike_review(
@@ -38,17 +69,8 @@ def unlike_review(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    like_obj = db.query(ReviewLike).filter(
-        ReviewLike.review_id == review_id, 
-        ReviewLike.user_id == current_user.user_id
-    ).first()
-    
-    if not like_obj:
-        raise CustomException(ErrorCode.RESOURCE_NOT_FOUND)
-    
-    db.delete(like_obj)
-    review = db.query(Review).filter(Review.review_id == review_id).first()
-    review.likes -= 1
-    db.commit()
-    
-    return APIResponse(isSuccess=True, message="좋아요를 취소했습니다.", payload={"likes": review.likes})
\ No newline at end of file
+    if like_buffer.enabled:
+        likes = like_buffer.unlike(db, review_id, current_user.user_id)
+    else:
+        likes = remove_like(db, review_id, current_user.user_id)
+    return APIResponse(isSuccess=True, message="좋아요를 취소했습니다.", payload={"likes": likes})
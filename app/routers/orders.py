@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import insert
+from typing import Optional
 from app.database import get_db
 from app.models import Order, OrderItem, Book, User, OrderStatus, UserRole
-from app.schemas import APIResponse, OrderCreate, OrderDto, OrderItemDto, OrderUpdate
+from app.schemas import APIResponse, OrderCreate, OrderDto, OrderItemDto, OrderListResponse, OrderUpdate
+from app.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.inventory import aggregate_quantities, reserve_stock, reservation_deadline, cancel_order, confirm_order
 from app.dependencies import get_current_user
 from app.exceptions import CustomException
 from app.error_codes import ErrorCode
+from app.responses import model_response
 
 router = APIRouter()
 
@@ -19,86 +26,115 @@ def create_order(
     if not order_req.items:
         return APIResponse(isSuccess=False, message="주문할 상품이 없습니다.")
 
-    total_amount = 0
-    order_items_data = []
+    # 1. 가격 계산 및 유효성 검사 (주문한 도서들을 IN 쿼리 한 번으로 조회)
+    quantities = aggregate_quantities(order_req.items)
+    prices = dict(db.query(Book.book_id, Book.price).filter(Book.book_id.in_(quantities)).all())
 
-    # 1. 가격 계산 및 유효성 검사
+    total_amount = Decimal("0")
+    order_items_data = []
     for item in order_req.items:
-        book = db.query(Book).filter(Book.book_id == item.book_id).first()
-        if not book:
+        if item.book_id not in prices:
             return APIResponse(isSuccess=False, message=f"도서(ID: {item.book_id})를 찾을 수 없습니다.")
-        if item.quantity > 100: 
-            raise CustomException(ErrorCode.OUT_OF_STOCK)
         # 가격 합산
-        price = float(book.price)
+        price = prices[item.book_id]
         total_amount += price * item.quantity
-        
+
         # 나중에 저장하기 위해 데이터 모으기
         order_items_data.append({
             "book_id": item.book_id,
             "quantity": item.quantity,
             "price": price
         })
-        
 
-    # 2. 주문 정보 저장 (Order)
+    # 2. 재고 차감 (부족하면 OUT_OF_STOCK, 아래 INSERT 전이라 롤백할 것이 없음)
+    reserve_stock(db, quantities)
+
+    # 3. 주문 정보 저장 (Order) - flush 로 order_id 만 받고 커밋은 마지막에 한 번
     new_order = Order(
         user_id=current_user.user_id,
         total_amount=total_amount,
-        status=OrderStatus.PENDING # 기본 상태: 결제 대기
+        status=OrderStatus.PENDING, # 기본 상태: 결제 대기
+        reserved_until=reservation_deadline() # 이 시각까지 결제가 없으면 취소 + 재고 복구
     )
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
+    db.flush()
+    order_id = new_order.order_id
 
-    # 3. 주문 상세 저장 (OrderItem)
+    # 4. 주문 상세 저장 (OrderItem) - 한 번의 bulk INSERT
     for item_data in order_items_data:
-        new_item = OrderItem(
-            order_id=new_order.order_id,
-            book_id=item_data["book_id"],
-            quantity=item_data["quantity"],
-            price=item_data["price"]
-        )
-        db.add(new_item)
-    
+        item_data["order_id"] = order_id
+    db.execute(insert(OrderItem), order_items_data)
+
+    # 재고 + 주문 + 상세를 하나의 트랜잭션으로 커밋 (중간에 실패하면 전부 롤백)
     db.commit()
 
     return APIResponse(
         isSuccess=True, 
         message="주문이 완료되었습니다.", 
-        payload={"order_id": new_order.order_id, "total_amount": total_amount}
+        payload={"order_id": order_id, "total_amount": float(total_amount)}
     )
 
 # 2. 내 주문 목록 조회
-@router.get("/api/orders", response_model=APIResponse[list[OrderDto]])
+# - 최신순, created_at 커서 페이지네이션 (이전 응답의 nextCursor 를 넘기면 이어서 조회)
+# - 주문 수와 상관없이 쿼리 2번: 주문 페이지 1번 + 그 주문들의 아이템(도서 제목 포함) 1번
+ORDER_SORT_KEY = "created_at,desc"
+
+@router.get("/api/orders", response_model=APIResponse[OrderListResponse])
 def get_my_orders(
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 최신순 조회
-    orders = db.query(Order).filter(Order.user_id == current_user.user_id).order_by(Order.created_at.desc()).all()
-    
-    result = []
-    for order in orders:
-        # 주문에 포함된 아이템 변환
-        items_dto = []
-        for item in order.items:
-            items_dto.append(OrderItemDto(
+    # 1. 주문 페이지 (필요한 컬럼만, 다음 페이지 확인용으로 size + 1 개)
+    query = db.query(Order.order_id, Order.total_amount, Order.status, Order.created_at).filter(
+        Order.user_id == current_user.user_id
+    )
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor, ORDER_SORT_KEY, Order.created_at)
+        query = query.filter(keyset_filter(Order.created_at, Order.order_id, last_created_at, last_id, True))
+    orders = query.order_by(Order.created_at.desc(), Order.order_id.desc()).limit(size + 1).all()
+
+    next_cursor = None
+    if len(orders) > size:
+        orders = orders[:size]
+        next_cursor = encode_cursor(ORDER_SORT_KEY, orders[-1].created_at, orders[-1].order_id)
+
+    # 2. 이 페이지 주문들의 아이템을 한 번에 (도서는 제목만 JOIN)
+    items_by_order = defaultdict(list)
+    if orders:
+        items = (
+            db.query(OrderItem.order_id, OrderItem.book_id, OrderItem.quantity, OrderItem.price, Book.title)
+            .join(Book, Book.book_id == OrderItem.book_id)
+            .filter(OrderItem.order_id.in_([order.order_id for order in orders]))
+            .order_by(OrderItem.order_item_id)
+            .all()
+        )
+        for item in items:
+            items_by_order[item.order_id].append(OrderItemDto(
                 book_id=item.book_id,
-                book_title=item.book.title,
+                book_title=item.title,
                 quantity=item.quantity,
                 price=float(item.price)
             ))
 
-        result.append(OrderDto(
+    result = [
+        OrderDto(
             order_id=order.order_id,
             total_amount=float(order.total_amount),
             status=order.status,
             created_at=order.created_at.isoformat() if order.created_at else "",
-            items=items_dto
-        ))
+            items=items_by_order[order.order_id]
+        )
+        for order in orders
+    ]
 
-    return APIResponse(isSuccess=True, message="주문 목록 조회 성공", payload=result)
+    # 이미 만든 DTO 로 응답 모델을 구성했으므로 response_model 재검증 없이 직렬화
+    return model_response(APIResponse[OrderListResponse](
+        isSuccess=True,
+        message="주문 목록 조회 성공",
+        payload=OrderListResponse(content=result, nextCursor=next_cursor)
+    ))
 
 @router.patch("/api/admin/orders/{order_id}", response_model=APIResponse)
 def update_order_status(
@@ -110,12 +146,26 @@ def update_order_status(
     if current_user.role != UserRole.ADMIN:
         return APIResponse(isSuccess=False, message="관리자 권한이 필요합니다.")
 
-    order = db.query(Order).filter(Order.order_id == order_id).first()
+    # PENDING 으로 되돌리면 재고 확보 만료 (reserved_until) 가 없는 PENDING 주문이 되어 재고가 영영 복구되지 않으므로 거부
+    try:
+        status = OrderStatus(order_req.status)
+    except ValueError:
+        raise CustomException(ErrorCode.INVALID_INPUT_VALUE)
+    if status == OrderStatus.PENDING:
+        raise CustomException(ErrorCode.INVALID_INPUT_VALUE)
+
+    order = db.query(Order.order_id).filter(Order.order_id == order_id).first()
     if not order:
         return APIResponse(isSuccess=False, message="주문을 찾을 수 없습니다.")
     
-    # 상태 업데이트 (PENDING -> PAID -> SHIPPED 등)
-    order.status = order_req.status
+    # 상태 업데이트 (PAID -> SHIPPED 등)
+    # 취소하면 재고 복구, 그 외에는 재고 확보 만료 해제 (이미 취소된 주문은 변경 불가)
+    if status == OrderStatus.CANCELLED:
+        changed = cancel_order(db, order_id)
+    else:
+        changed = confirm_order(db, order_id, status)
+    if not changed:
+        return APIResponse(isSuccess=False, message="취소된 주문은 상태를 변경할 수 없습니다.")
     db.commit()
     
     return APIResponse(isSuccess=True, message="주문 상태를 변경했습니다.")
\ No newline at end of file
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Review, User, Book
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional
+from app.database import get_db, get_async_read_db
+from app.models import Review, User, Book, BookRatingStats
+from app.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.rating_stats import add_review_stats, change_review_stats, remove_review_stats, validate_rating
+from app.cache import book_cache
 from app.schemas import APIResponse, ReviewCreate, ReviewDto, ReviewListResponse, ReviewUpdate
 from app.dependencies import get_current_user
 router = APIRouter()
 
 
+# 리뷰 집계가 바뀌면 이 도서가 포함된 캐시 응답 + 평점/리뷰 수 정렬 목록 무효화
+def _invalidate_book(book_id: int):
+    book_cache.invalidate_tags(f"book:{book_id}", "sort:rating", "sort:review_count")
+
+
 # 1. 리뷰 작성 (로그인 필수)
 @router.post("/api/books/{book_id}/reviews", response_model=APIResponse)
 def create_review(
@@ -15,6 +26,8 @@ def create_review(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    validate_rating(review_req.rating)
+
     # 책이 진짜 있는지 확인
     book = db.query(Book).filter(Book.book_id == book_id).first()
     if not book:
@@ -28,37 +41,68 @@ def create_review(
         content=review_req.content
     )
     db.add(new_review)
+    add_review_stats(db, book_id, review_req.rating)
     db.commit()
+    _invalidate_book(book_id)
     
     return APIResponse(isSuccess=True, message="리뷰가 작성되었습니다.")
 
 # 2. 특정 도서의 리뷰 목록 조회 (누구나 가능)
+# - 최신순, (created_at, review_id) 커서 페이지네이션 (이전 응답의 nextCursor 를 넘기면 이어서 조회)
+# - 작성자 이름은 JOIN 으로 함께 조회, totalCount 는 book_rating_stats 에 미리 집계된 값
+REVIEW_SORT_KEY = "created_at,desc"
+
 @router.get("/api/books/{book_id}/reviews", response_model=APIResponse[ReviewListResponse])
-def get_book_reviews(book_id: int, db: Session = Depends(get_db)):
-    # 최신순 정렬
-    reviews = db.query(Review).filter(Review.book_id == book_id).order_by(Review.created_at.desc()).all()
-    
+async def get_book_reviews(
+    book_id: int,
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    query = (
+        select(Review.review_id, Review.user_id, User.username, Review.rating, Review.content, Review.created_at)
+        .join(User, User.user_id == Review.user_id)
+        .where(Review.book_id == book_id)
+    )
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor, REVIEW_SORT_KEY, Review.created_at)
+        query = query.where(keyset_filter(Review.created_at, Review.review_id, last_created_at, last_id, True))
+    rows = (await db.execute(
+        query.order_by(Review.created_at.desc(), Review.review_id.desc()).limit(size + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(REVIEW_SORT_KEY, rows[-1].created_at, rows[-1].review_id)
+
+    total_count = await db.scalar(
+        select(BookRatingStats.review_count).where(BookRatingStats.book_id == book_id)
+    )
+
     # DTO 변환 (User 정보 포함)
-    review_dtos = []
-    for r in reviews:
-        dto = ReviewDto(
+    review_dtos = [
+        ReviewDto(
             review_id=r.review_id,
             user_id=r.user_id,
-            username=r.user.username, # 관계형 데이터(User) 접근
+            username=r.username,
             rating=r.rating,
             content=r.content,
             created_at=r.created_at.isoformat() if r.created_at else ""
         )
-        review_dtos.append(dto)
+        for r in rows
+    ]
 
     return APIResponse(
         isSuccess=True,
         message="리뷰 목록 조회 성공",
         payload={
             "content": review_dtos,
-            "totalCount": len(review_dtos)
+            "totalCount": total_count or 0,
+            "nextCursor": next_cursor
         }
     )
+
 @router.get("/api/reviews/me", response_model=APIResponse[list[ReviewDto]])
 def get_my_reviews(
     db: Session = Depends(get_db),
@@ -95,12 +139,18 @@ def update_review(
     if review.user_id != current_user.user_id:
         return APIResponse(isSuccess=False, message="수정 권한이 없습니다.")
 
+    book_id = review.book_id
+    rating_changed = bool(review_req.rating) and review_req.rating != review.rating
     if review_req.rating:
+        validate_rating(review_req.rating)
+        change_review_stats(db, book_id, review.rating, review_req.rating)
         review.rating = review_req.rating
     if review_req.content:
         review.content = review_req.content
     
     db.commit()
+    if rating_changed:
+        _invalidate_book(book_id)
     return APIResponse(isSuccess=True, message="리뷰를 수정했습니다.")
 
 # 5. 리뷰 삭제
@@ -118,6 +168,9 @@ def delete_review(
     if review.user_id != current_user.user_id and current_user.role != "ADMIN":
         return APIResponse(isSuccess=False, message="삭제 권한이 없습니다.")
 
+    book_id = review.book_id
+    remove_review_stats(db, book_id, review.rating)
     db.delete(review)
     db.commit()
+    _invalidate_book(book_id)
     return APIResponse(isSuccess=True, message="리뷰를 삭제했습니다.")
\ No newline at end of file
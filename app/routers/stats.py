@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.database import get_db
+from app.database import get_db, engine, async_engine, replica_set, pool_metrics, pool_status
 from app.models import User, Order, Book, UserRole
 from app.schemas import APIResponse
 from app.dependencies import get_current_user
-router = APIRouter()
+from app.cache import book_cache
+from app.password_hasher import password_hasher
+from app.like_buffer import like_buffer
+from app.responses import FastJSONResponse
+# response_model 이 없는 라우트들이라 dict 직렬화를 orjson 으로
+router = APIRouter(default_response_class=FastJSONResponse)
 
 @router.get("/api/admin/stats/users", summary="총 유저 수 조회 (관리자)")
 def get_user_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -26,4 +31,31 @@ def get_book_stats(db: Session = Depends(get_db), current_user: User = Depends(g
     if current_user.role != UserRole.ADMIN:
         return APIResponse(isSuccess=False, message="권한이 없습니다.")
     count = db.query(Book).count()
-    return APIResponse(isSuccess=True, message="성공", payload={"total_books": count})
\ No newline at end of file
+    return APIResponse(isSuccess=True, message="성공", payload={"total_books": count})
+
+@router.get("/api/admin/stats/cache", summary="도서 응답 캐시 현황 조회 (관리자)")
+def get_cache_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        return APIResponse(isSuccess=False, message="권한이 없습니다.")
+    return APIResponse(isSuccess=True, message="성공", payload={"book_cache": book_cache.stats()})
+
+
+@router.get("/api/admin/stats/password-hasher", summary="비밀번호 해싱 풀 현황 조회 (관리자)")
+def get_password_hasher_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        return APIResponse(isSuccess=False, message="권한이 없습니다.")
+    return APIResponse(isSuccess=True, message="성공", payload=password_hasher.stats())
+
+
+@router.get("/api/admin/stats/db-pool", summary="DB 커넥션 풀 현황 조회 (관리자)")
+def get_db_pool_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        return APIResponse(isSuccess=False, message="권한이 없습니다.")
+    return APIResponse(isSuccess=True, message="성공", payload={"pool": pool_status(engine), "async_pool": pool_status(async_engine.sync_engine), "replicas": replica_set.status(), "metrics": pool_metrics.snapshot()})
+
+
+@router.get("/api/admin/stats/like-buffer", summary="좋아요 write-behind 버퍼 현황 조회 (관리자)")
+def get_like_buffer_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        return APIResponse(isSuccess=False, message="권한이 없습니다.")
+    return APIResponse(isSuccess=True, message="성공", payload=like_buffer.stats())
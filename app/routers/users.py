@@ -8,6 +8,7 @@ from app.models import User
 from pydantic import BaseModel
 from datetime import datetime
 from app.models import UserRole
+from app.auth_cache import invalidate_user
 
 router = APIRouter()
 
@@ -38,6 +39,7 @@ def update_my_info(
 ):
     current_user.username = user_req.username
     db.commit()
+    invalidate_user(current_user.user_id)
     return APIResponse(isSuccess=True, message="정보를 수정했습니다.", payload={"username": current_user.username})
 
 # 3. 회원 탈퇴 (Soft Delete)
@@ -52,6 +54,7 @@ def withdraw(
         # 현재 시간 기록 (이게 있으면 탈퇴한 것으로 간주)
     current_user.deleted_at = datetime.now()
     db.commit()
+    invalidate_user(current_user.user_id)
     return APIResponse(isSuccess=True, message="회원 탈퇴 처리되었습니다.")
 
 # [Admin] 6. 유저 영구 삭제 (관리자 전용)
@@ -73,5 +76,6 @@ def hard_delete_user(
     # [주의] 진짜로 DB에서 날려버림
     db.delete(target_user)
     db.commit()
+    invalidate_user(user_id)
     
     return APIResponse(isSuccess=True, message=f"유저(ID: {user_id})를 영구 삭제했습니다.")
\ No newline at end of file
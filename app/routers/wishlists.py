@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, insert_ignore
 from app.models import Wishlist, Book, User
 from app.schemas import APIResponse, WishlistCreate, WishlistDto
 from app.dependencies import get_current_user
@@ -14,18 +14,15 @@ def add_favorite(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 이미 추가했는지 확인
-    exists = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.user_id,
-        Wishlist.book_id == wish_req.book_id
-    ).first()
-    
-    if exists:
-        return APIResponse(isSuccess=False, message="이미 위시리스트에 존재합니다.")
-    
-    new_wish = Wishlist(user_id=current_user.user_id, book_id=wish_req.book_id)
-    db.add(new_wish)
+    # 없는 도서는 먼저 거부 (INSERT IGNORE 는 외래 키 오류도 경고로 바꿔서 "이미 존재" 로 보이므로)
+    if db.get(Book, wish_req.book_id) is None:
+        return APIResponse(isSuccess=False, message="도서를 찾을 수 없습니다.")
+
+    # (user_id, book_id) unique 인덱스로 중복 방지 - 이미 있으면 INSERT 가 무시됨 (동시 요청에도 한 행)
+    added = insert_ignore(db, Wishlist, [{"user_id": current_user.user_id, "book_id": wish_req.book_id}])
     db.commit()
+    if not added:
+        return APIResponse(isSuccess=False, message="이미 위시리스트에 존재합니다.")
     
     return APIResponse(isSuccess=True, message="위시리스트에 추가했습니다.")
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, Generic, TypeVar
 from datetime import datetime
 
@@ -44,9 +44,19 @@ class BookCreate(BaseModel):
     publisher: str
     summary: Optional[str] = None
     price: float
+    stock: Optional[int] = None  # 재고 수량 (등록 시 없으면 0, 수정 시 없으면 그대로)
     # 실제 구현에선 저자/카테고리 ID 리스트를 받아서 연결해야 하지만, 
     # 일단 필수 기능 위주로 문자열 데이터부터 처리합니다.
 
+# 도서 평점 집계 (리뷰가 없으면 rating_avg 는 0)
+class BookRatingDto(BaseModel):
+    review_count: int = 0
+    rating_avg: float = 0
+    histogram: dict[str, int] = {}  # {"1": 개수, ..., "5": 개수}
+
+    class Config:
+        from_attributes = True
+
 # 도서 정보 응답 (공통)
 class BookDto(BaseModel):
     book_id: int
@@ -56,21 +66,24 @@ class BookDto(BaseModel):
     summary: Optional[str] = None
     price: float
     created_at: Optional[datetime] = None
+    rating_stats: Optional[BookRatingDto] = None
 
     class Config:
         from_attributes = True # ORM 객체를 Pydantic으로 변환 허용
 
 # 페이지네이션 정보
+# (cursor 모드에서는 page 가 없고, withCount=false 이면 totalCount/totalPages 가 비어있음)
 class Pagination(BaseModel):
-    totalCount: int
-    page: int
+    totalCount: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    totalPages: int
+    totalPages: Optional[int] = None
 
 # 도서 목록 응답 (페이지네이션 포함)
 class BookListResponse(BaseModel):
     content: list[BookDto]
     pagination: Pagination
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
 
 
 # 리뷰 작성 요청
@@ -94,10 +107,11 @@ class ReviewDto(BaseModel):
 class ReviewListResponse(BaseModel):
     content: list[ReviewDto]
     totalCount: int    
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
 
 class CartItemCreate(BaseModel):
     book_id: int
-    quantity: int = 1
+    quantity: int = Field(1, gt=0)  # 0 이하는 422 (주문 시 재고가 늘어나지 않도록)
 
 # [리뷰] 수정 요청
 class ReviewUpdate(BaseModel):
@@ -152,6 +166,11 @@ class OrderDto(BaseModel):
     class Config:
         from_attributes = True
 
+# 주문 목록 응답 (created_at 커서 페이지네이션)
+class OrderListResponse(BaseModel):
+    content: list[OrderDto]
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
+
 
 # [주문] 상태 변경 요청 (관리자용)
 class OrderUpdate(BaseModel):
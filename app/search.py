@@ -0,0 +1,151 @@
+# app/search.py
+# 도서 검색 (제목/저자/요약)
+# - MySQL: books 의 FULLTEXT(ngram) 인덱스를 MATCH ... AGAINST 로 사용
+# - 그 외(SQLite 테스트 등): 프로세스 내 역색인(inverted index)으로 대체
+import asyncio
+import math
+import re
+import threading
+from collections import defaultdict
+from sqlalchemy import Float, type_coerce
+from sqlalchemy.dialects.mysql import match
+from app.models import Book
+
+# MySQL ngram 파서 기본값(ngram_token_size=2)과 같은 단위로 색인
+NGRAM_SIZE = 2
+# 필드별 가중치 (제목 > 저자 > 요약)
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "summary": 1.0}
+
+_TERM_SPLIT = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def split_terms(text: str) -> list[str]:
+    return [t for t in _TERM_SPLIT.split((text or "").lower()) if t]
+
+
+def ngrams(term: str) -> list[str]:
+    if len(term) <= NGRAM_SIZE:
+        return [term]
+    return [term[i:i + NGRAM_SIZE] for i in range(len(term) - NGRAM_SIZE + 1)]
+
+
+def fulltext_available(db) -> bool:
+    return db.bind.dialect.name == "mysql"
+
+
+# MySQL: 검색어의 모든 단어를 포함(+"단어")하는 도서만, 관련도 점수와 함께
+# (boolean mode 연산자 문자는 제거해서 사용자 입력이 쿼리 문법이 되지 않도록 함)
+def fulltext_relevance(search: str):
+    terms = split_terms(search)
+    against = " ".join(f'+"{t}"' for t in terms) or '""'
+    return type_coerce(
+        match(Book.title, Book.author, Book.summary, against=against).in_boolean_mode(),
+        Float,
+    )
+
+
+class BookSearchIndex:
+    """FULLTEXT 인덱스가 없는 DB용 역색인. 첫 검색 때 DB에서 한 번 적재하고,
+    이후에는 관리자 도서 등록/수정/삭제 시 upsert/remove 로 갱신한다."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = asyncio.Lock()  # 비동기 첫 빌드 (ensure_built_async) 를 한 코루틴만
+        self._built = False
+        self._postings = defaultdict(dict)   # gram -> {book_id: 가중 tf}
+        self._doc_grams = {}                 # book_id -> set(gram)
+        self._doc_text = {}                  # book_id -> 소문자 본문 (부분 문자열 검증용)
+
+    def _index(self, book_id, title, author, summary):
+        self._remove(book_id)
+        weights = defaultdict(float)
+        for field, value in zip(("title", "author", "summary"), (title, author, summary)):
+            for term in split_terms(value):
+                for gram in ngrams(term):
+                    weights[gram] += FIELD_WEIGHTS[field]
+        for gram, tf in weights.items():
+            self._postings[gram][book_id] = tf
+        self._doc_grams[book_id] = set(weights)
+        self._doc_text[book_id] = " ".join(v or "" for v in (title, author, summary)).lower()
+
+    def _remove(self, book_id):
+        for gram in self._doc_grams.pop(book_id, ()):
+            docs = self._postings.get(gram)
+            if docs is not None:
+                docs.pop(book_id, None)
+                if not docs:
+                    del self._postings[gram]
+        self._doc_text.pop(book_id, None)
+
+    # 2글자보다 짧은 검색어는 그 글자를 포함하는 모든 gram 의 문서를 합쳐서 사용
+    def _postings_for(self, gram):
+        if len(gram) >= NGRAM_SIZE:
+            return self._postings.get(gram, {})
+        merged = {}
+        for key, docs in self._postings.items():
+            if gram in key:
+                for book_id, tf in docs.items():
+                    merged[book_id] = max(merged.get(book_id, 0.0), tf)
+        return merged
+
+    def ensure_built(self, db):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            rows = db.query(Book.book_id, Book.title, Book.author, Book.summary).all()
+            for row in rows:
+                self._index(row.book_id, row.title, row.author, row.summary)
+            self._built = True
+
+    # 비동기 세션용. run_sync 의 greenlet 은 이벤트 루프 스레드에서 돌아서 RLock 이 재진입을 허용하므로,
+    # 첫 빌드가 SELECT 에서 멈춘 사이 다른 코루틴이 들어와 books 전체를 한 번 더 읽지 않도록 asyncio.Lock 으로 막음
+    async def ensure_built_async(self, db):
+        if self._built:
+            return
+        async with self._build_lock:
+            await db.run_sync(self.ensure_built)
+
+    def upsert(self, book):
+        with self._lock:
+            if self._built:
+                self._index(book.book_id, book.title, book.author, book.summary)
+
+    def remove(self, book_id: int):
+        with self._lock:
+            if self._built:
+                self._remove(book_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_grams.clear()
+            self._doc_text.clear()
+            self._built = False
+
+    # 모든 단어를 포함하는 도서를 관련도(tf-idf) 내림차순, 동점이면 book_id 내림차순으로 반환
+    # (호출 전에 ensure_built 로 적재되어 있어야 함 - 비동기 세션은 ensure_built_async)
+    def search(self, search: str) -> list[tuple[int, float]]:
+        terms = split_terms(search)
+        if not terms:
+            return []
+        grams = {g for t in terms for g in ngrams(t)}
+        with self._lock:
+            postings = [self._postings_for(g) for g in grams]
+            if not all(postings):
+                return []
+            candidates = set.intersection(*(set(p) for p in postings))
+            total = len(self._doc_grams) or 1
+            scores = []
+            for book_id in candidates:
+                text = self._doc_text[book_id]
+                if not all(t in text for t in terms):
+                    continue
+                score = sum(p[book_id] * math.log(1 + total / len(p)) for p in postings)
+                scores.append((book_id, round(score, 6)))
+        scores.sort(key=lambda x: (x[1], x[0]), reverse=True)
+        return scores
+
+
+book_search_index = BookSearchIndex()
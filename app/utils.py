@@ -2,10 +2,11 @@ from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt
-from app.config import SECRET_KEY, ALGORITHM # 나중에 config.py 만들 예정
+import uuid
+from app.config import SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS # 나중에 config.py 만들 예정
 
-# 비밀번호 해싱 설정 (bcrypt 사용)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 설정 (bcrypt 사용, cost 는 BCRYPT_ROUNDS)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # 1. 비밀번호 해시화 (암호 만들기)
 def get_password_hash(password):
@@ -15,6 +16,10 @@ def get_password_hash(password):
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+# 2-1. 비밀번호 검증 + 재해싱 (cost 설정이 바뀐 해시면 새 해시도 함께 반환, 아니면 None)
+def verify_and_update_password(plain_password, hashed_password):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 # 3. JWT 액세스 토큰 생성
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -23,6 +28,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15) # 기본 15분
     
-    to_encode.update({"exp": expire})
+    # jti: 같은 초에 발급된 토큰도 서로 다른 값이 되도록 (로그아웃은 토큰 단위)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
\ No newline at end of file
@@ -0,0 +1,77 @@
+# benchmarks/compression.py
+# 대표 엔드포인트 응답의 압축 전/후 크기 (bytes-on-wire) 와 압축 CPU 시간
+# - 실제 앱에서 압축 없이 (Accept-Encoding: identity) 본문을 받아온 뒤, 같은 본문을 인코딩/레벨별로 반복 압축
+# - CPU 시간은 time.process_time 기준 (응답 하나 압축에 드는 시간), 크기는 압축된 본문 바이트
+# - 작은 에러 envelope 는 압축해도 거의 줄지 않거나 오히려 커짐 (COMPRESSION_MINIMUM_SIZE 로 제외하는 이유)
+#
+# 실행: DB_URL=sqlite:///./bench.db python -m benchmarks.compression --repeat 200 --orders 50
+import argparse
+import time
+from fastapi.testclient import TestClient
+from app.compression import brotli, compress
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+
+def fetch_bodies(client: TestClient, orders: int) -> dict:
+    identity = {"Accept-Encoding": "identity"}
+    login = client.post("/api/auth/login", json={"email": "user0@example.com", "password": "password123"})
+    auth = {**identity, "Authorization": f"Bearer {login.json()['payload']['accessToken']}"}
+    # 리뷰가 가장 많은 도서 (상세/리뷰 목록), 주문 내역은 부족하면 주문을 만들어서 채움 (DB_URL 의 DB 에 기록됨)
+    books = client.get("/api/public/books?size=100&sort=review_count,desc", headers=identity).json()["payload"]["content"]
+    book_id = books[0]["book_id"]
+    existing = len(client.get(f"/api/orders?size={orders}", headers=auth).json()["payload"]["content"])
+    for i in range(existing, orders):
+        items = [{"book_id": books[(i + j) % len(books)]["book_id"], "quantity": 1} for j in range(3)]
+        client.post("/api/orders", json={"items": items}, headers=auth)
+    paths = {
+        "GET /api/public/books?size=10": ("/api/public/books?size=10", identity),
+        "GET /api/public/books?size=100": ("/api/public/books?size=100", identity),
+        "GET /api/public/books/{id}": (f"/api/public/books/{book_id}", identity),
+        "GET /api/books/{id}/reviews": (f"/api/books/{book_id}/reviews", identity),
+        f"GET /api/orders?size={orders}": (f"/api/orders?size={orders}", auth),
+        "404 error envelope": ("/api/public/no-such-path", identity),
+    }
+    bodies = {}
+    for name, (path, headers) in paths.items():
+        response = client.get(path, headers=headers)
+        assert "content-encoding" not in response.headers
+        bodies[name] = response.content
+    return bodies
+
+
+def cpu_us(body: bytes, encoding: str, level: int, repeat: int) -> float:
+    options = {"gzip_level": level} if encoding == "gzip" else {"brotli_quality": level}
+    start = time.process_time()
+    for _ in range(repeat):
+        compress(body, encoding, **options)
+    return (time.process_time() - start) / repeat * 1e6
+
+
+def run(repeat: int, orders: int):
+    from app.main import app
+    bodies = fetch_bodies(TestClient(app), orders)
+    variants = [("gzip", level) for level in GZIP_LEVELS]
+    if brotli is not None:
+        variants += [("br", quality) for quality in BROTLI_QUALITIES]
+    else:
+        print("(brotli 패키지가 없어서 gzip 만 측정)")
+
+    results = {}
+    for name, body in bodies.items():
+        print(f"{name}: {len(body):,} bytes (identity)")
+        for encoding, level in variants:
+            size = len(compress(body, encoding, level, level))
+            results[(name, encoding, level)] = (size, cpu_us(body, encoding, level, repeat))
+            print(f"  {encoding:4s} level {level:2d}  {size:8,} bytes ({size / len(body) * 100:5.1f}%)"
+                  f"  {results[(name, encoding, level)][1]:8.1f} us CPU")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="응답 압축 크기/CPU 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=50, help="측정할 주문 내역 길이 (부족하면 주문 생성)")
+    args = parser.parse_args()
+    run(args.repeat, args.orders)
@@ -0,0 +1,59 @@
+# benchmarks/metrics_overhead.py
+# MetricsMiddleware 가 요청마다 더하는 시간 측정
+# - DB 를 쓰지 않는 최소 FastAPI 앱 (경로 파라미터가 있는 라우트) 을 미들웨어 없이/있이 만들어서
+#   같은 요청을 프로세스 안에서 (httpx ASGITransport, 네트워크 없음) 반복 호출
+# - 두 앱의 요청당 평균 시간 차이 = 미들웨어 오버헤드 (라우트 템플릿 조회, 카운터/히스토그램 갱신, 쿼리 수 contextvar)
+#
+# 실행: python -m benchmarks.metrics_overhead --requests 20000
+import argparse
+import asyncio
+import time
+import httpx
+from fastapi import FastAPI
+from app.metrics import MetricsMiddleware
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def measure(app, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(200):  # 워밍업
+            await client.get(f"/items/{i}")
+        start = time.perf_counter()
+        for i in range(requests):
+            await client.get(f"/items/{i}")
+        return time.perf_counter() - start
+
+
+def run(requests: int, rounds: int):
+    results = {False: [], True: []}
+    for _ in range(rounds):
+        # 순서 영향을 줄이려고 번갈아 측정, 라운드별 최솟값 사용
+        for with_metrics in (False, True):
+            results[with_metrics].append(asyncio.run(measure(build_app(with_metrics), requests)))
+    baseline, instrumented = min(results[False]), min(results[True])
+    per_request_us = (instrumented - baseline) / requests * 1e6
+    print(f"requests={requests} rounds={rounds}")
+    print(f"without metrics: {requests / baseline:,.0f} req/s ({baseline / requests * 1e6:.1f} us/req)")
+    print(f"with metrics:    {requests / instrumented:,.0f} req/s ({instrumented / requests * 1e6:.1f} us/req)")
+    print(f"overhead: {per_request_us:.1f} us/req ({(instrumented / baseline - 1) * 100:.1f}%)")
+    return per_request_us
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MetricsMiddleware 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run(args.requests, args.rounds)
@@ -0,0 +1,101 @@
+# benchmarks/middleware_throughput.py
+# 요청 로그 미들웨어 교체 전/후 처리량 (GET /api/public/books)
+# - before: 이전 LoggingMiddleware (BaseHTTPMiddleware, 요청당 INFO 로그 2줄, f-string)
+# - after: RequestLoggingMiddleware (순수 ASGI, 요청당 1줄, 큐 + 별도 스레드 출력) + 선택적으로 샘플링
+# - 같은 라우트/예외 처리기를 가진 앱을 미들웨어만 바꿔 만들고, 프로세스 안에서 (httpx ASGITransport)
+#   동시 요청 concurrency 개로 반복 호출. 도서 목록은 응답 캐시에 걸리므로 미들웨어 비용이 잘 드러남
+#
+# 실행: DB_URL=sqlite:///./bench.db python -m benchmarks.middleware_throughput --requests 5000 --concurrency 16
+import argparse
+import asyncio
+import logging
+import time
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.config import REQUEST_LOG_ASYNC
+from app.request_logging import RequestLoggingMiddleware, start_async_access_log, stop_async_access_log
+
+logger = logging.getLogger("benchmark.legacy")
+
+
+# 교체 전 미들웨어 (app/main.py 에 있던 그대로)
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        logger.info(f"REQ: {request.method} {request.url.path}")
+        try:
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            logger.info(f"RES: {response.status_code} | Time: {process_time:.4f}s")
+            return response
+        except Exception as e:
+            logger.error(f"ERROR: {str(e)}", exc_info=True)
+            raise e
+
+
+def build_app(middleware, **options) -> FastAPI:
+    from app.main import app as main_app, limiter
+    app = FastAPI()
+    app.router.routes.extend(main_app.router.routes)
+    app.exception_handlers.update(main_app.exception_handlers)
+    app.state.limiter = limiter
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def measure(app, requests: int, concurrency: int, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # 워밍업 (응답 캐시 채우기)
+            await client.get(path)
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path)
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def run(requests: int, concurrency: int, rounds: int, path: str, log_file: str):
+    # 로그 출력 비용도 포함해서 비교 (두 방식 모두 같은 파일 핸들러로, app.main 을 불러오기 전에 설정)
+    logging.basicConfig(level=logging.INFO, filename=log_file, force=True)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # 앱 lifespan 대신 직접 출력 스레드 시작
+    access_log_listener = start_async_access_log() if REQUEST_LOG_ASYNC else None
+    variants = {
+        "no middleware": (None, {}),
+        "before: BaseHTTPMiddleware": (LegacyLoggingMiddleware, {}),
+        "after: pure ASGI": (RequestLoggingMiddleware, {"sample_rate": 1.0}),
+        "after: pure ASGI, 10% sampled": (RequestLoggingMiddleware, {"sample_rate": 0.1}),
+    }
+    best = {name: float("inf") for name in variants}
+    try:
+        for _ in range(rounds):
+            for name, (middleware, options) in variants.items():
+                elapsed = asyncio.run(measure(build_app(middleware, **options), requests, concurrency, path))
+                best[name] = min(best[name], elapsed)
+    finally:
+        if access_log_listener is not None:
+            stop_async_access_log(access_log_listener)
+
+    print(f"GET {path} requests={requests} concurrency={concurrency} rounds={rounds} (best round)")
+    for name, elapsed in best.items():
+        print(f"{name:32s} {requests / elapsed:8,.0f} req/s  {elapsed / requests * 1e6:7.1f} us/req")
+    return {name: requests / elapsed for name, elapsed in best.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요청 로그 미들웨어 전/후 처리량 벤치마크")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--path", default="/api/public/books?size=10")
+    parser.add_argument("--log-file", default="benchmark-access.log")
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.rounds, args.path, args.log_file)
@@ -0,0 +1,128 @@
+# benchmarks/serialization.py
+# 큰 응답 (도서 목록, 주문 내역) 의 직렬화 방식별 시간 비교 (DB 없이 메모리의 DTO 로만)
+# - fastapi default: 엔드포인트가 돌려준 APIResponse 를 response_model 로 다시 검증 + pydantic dump_json (기존 방식)
+# - orjson class: 다시 검증 + dump_python + orjson (default_response_class 를 바꿨을 때 FastAPI 가 하는 일)
+# - stdlib json: 다시 검증 + dump_python + json.dumps (JSONResponse 를 지정했을 때)
+# - trusted model: 이미 DTO 로 만든 APIResponse[...] 를 재검증 없이 바로 dump_json (app.responses.model_response)
+# 모든 방식의 출력이 같은지도 확인 (stdlib json 은 공백/이스케이프 차이만 있으므로 파싱해서 비교)
+#
+# 실행: python -m benchmarks.serialization --books 100 --orders 50
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from pydantic import TypeAdapter
+from app.responses import FastJSONResponse, dump_json
+from app.schemas import (
+    APIResponse, BookDto, BookListResponse, BookRatingDto, OrderDto, OrderItemDto, OrderListResponse, Pagination,
+)
+
+
+def make_books(count: int) -> APIResponse[BookListResponse]:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    books = [
+        BookDto(
+            book_id=i,
+            title=f"도서 제목 {i}",
+            author=f"저자 {i % 50}",
+            publisher=f"출판사 {i % 20}",
+            summary="이 책은 성능 측정용 요약입니다. " * 8,
+            price=12000 + i * 10,
+            created_at=now - timedelta(minutes=i),
+            rating_stats=BookRatingDto(review_count=i % 30, rating_avg=round(3 + (i % 20) / 10, 2)),
+        )
+        for i in range(1, count + 1)
+    ]
+    payload = BookListResponse(
+        content=books,
+        pagination=Pagination(totalCount=count * 10, page=1, size=count, totalPages=10),
+        nextCursor="eyJrIjoiY3JlYXRlZF9hdCxkZXNjIn0",
+    )
+    return APIResponse[BookListResponse](isSuccess=True, message="도서 목록 조회 성공", payload=payload)
+
+
+def make_orders(count: int, items_per_order: int = 5) -> APIResponse[OrderListResponse]:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    orders = [
+        OrderDto(
+            order_id=i,
+            total_amount=15000.0 * items_per_order,
+            status="PAID",
+            created_at=(now - timedelta(hours=i)).isoformat(),
+            items=[
+                OrderItemDto(book_id=i * 10 + j, book_title=f"도서 제목 {i * 10 + j}", quantity=1 + j % 3, price=15000.0)
+                for j in range(items_per_order)
+            ],
+        )
+        for i in range(1, count + 1)
+    ]
+    payload = OrderListResponse(content=orders, nextCursor=None)
+    return APIResponse[OrderListResponse](isSuccess=True, message="주문 목록 조회 성공", payload=payload)
+
+
+# 라우트에서 돌려주던 형태 (payload 가 dict 인 타입 없는 APIResponse)
+def untyped(result: APIResponse) -> APIResponse:
+    payload = {name: getattr(result.payload, name) for name in type(result.payload).model_fields}
+    return APIResponse(isSuccess=result.isSuccess, message=result.message, payload=payload)
+
+
+def variants(response_model, result):
+    adapter = TypeAdapter(response_model)
+    returned = untyped(result)
+    orjson_response = FastJSONResponse.__new__(FastJSONResponse)
+
+    def revalidate():
+        # FastAPI serialize_response 와 같은 호출
+        return adapter.validate_python(returned, from_attributes=True)
+
+    return {
+        "fastapi default (validate + dump_json)": lambda: adapter.dump_json(revalidate()),
+        "orjson class (validate + orjson)": lambda: orjson_response.render(adapter.dump_python(revalidate(), mode="json")),
+        "stdlib json (validate + json.dumps)": lambda: json.dumps(
+            adapter.dump_python(revalidate(), mode="json"), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "trusted model (no revalidation)": lambda: dump_json(result),
+    }
+
+
+def measure(fn, repeat: int) -> float:
+    for _ in range(20):  # 워밍업
+        fn()
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def run(books: int, orders: int, repeat: int):
+    cases = {
+        f"book list ({books} books)": (APIResponse[BookListResponse], make_books(books)),
+        f"order history ({orders} orders x 5 items)": (APIResponse[OrderListResponse], make_orders(orders)),
+    }
+    results = {}
+    for case, (response_model, result) in cases.items():
+        funcs = variants(response_model, result)
+        outputs = {name: fn() for name, fn in funcs.items()}
+        expected = json.loads(outputs["fastapi default (validate + dump_json)"])
+        assert all(json.loads(body) == expected for body in outputs.values()), "직렬화 결과가 다름"
+        size = len(outputs["trusted model (no revalidation)"])
+        print(f"{case}: {size:,} bytes")
+        baseline = None
+        for name, fn in funcs.items():
+            seconds = measure(fn, repeat)
+            baseline = baseline or seconds
+            results[(case, name)] = seconds
+            print(f"  {name:40s} {seconds * 1e6:8.1f} us  ({baseline / seconds:.2f}x)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="응답 직렬화 방식별 마이크로벤치마크")
+    parser.add_argument("--books", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.books, args.orders, args.repeat)
@@ -0,0 +1,120 @@
+# benchmarks/stock_contention.py
+# 인기 도서 한정 판매(flash sale) 상황의 재고 차감 처리량 측정
+# - DB_URL 이 가리키는 DB 에 임시 도서(hot item)를 만들고, 여러 스레드가 동시에 재고를 차감
+# - 주문마다 hot item 여러 권을 무작위 순서로 담아서 정렬된 잠금 순서가 교착을 막는지 확인
+# - 끝나면 초과 판매가 없는지(남은 재고 = 초기 재고 - 성공 수량) 검증하고 임시 데이터 삭제
+#
+# 실행: DB_URL=mysql+pymysql://... python -m benchmarks.stock_contention --workers 32 --orders 5000
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from sqlalchemy.exc import OperationalError
+from app.database import SessionLocal
+from app.exceptions import CustomException
+from app.inventory import aggregate_quantities, reserve_stock
+from app.models import Book, BookStock
+
+
+class _Item:
+    def __init__(self, book_id, quantity):
+        self.book_id = book_id
+        self.quantity = quantity
+
+
+def create_hot_items(count: int, stock: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        books = [
+            Book(title=f"benchmark hot item {i}", author="benchmark", publisher="benchmark", price=10000,
+                 stock=BookStock(stock=stock))
+            for i in range(count)
+        ]
+        db.add_all(books)
+        db.commit()
+        return [book.book_id for book in books]
+    finally:
+        db.close()
+
+
+def remaining_stock(book_ids) -> dict[int, int]:
+    db = SessionLocal()
+    try:
+        return dict(db.query(BookStock.book_id, BookStock.stock).filter(BookStock.book_id.in_(book_ids)).all())
+    finally:
+        db.close()
+
+
+def drop_hot_items(book_ids):
+    db = SessionLocal()
+    try:
+        for book in db.query(Book).filter(Book.book_id.in_(book_ids)).all():
+            db.delete(book)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(workers: int, orders: int, hot_items: int, items_per_order: int, stock: int):
+    book_ids = create_hot_items(hot_items, stock)
+    results = Counter()
+    sold = Counter()
+    lock = threading.Lock()
+    remaining = iter(range(orders))
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            # 무작위 순서로 담아도 aggregate_quantities 가 book_id 순으로 정렬
+            picked = random.sample(book_ids, min(items_per_order, len(book_ids)))
+            quantities = aggregate_quantities([_Item(book_id, 1) for book_id in picked])
+            db = SessionLocal()
+            try:
+                reserve_stock(db, quantities)
+                db.commit()
+                outcome = "ok"
+            except CustomException:
+                db.rollback()
+                outcome = "out_of_stock"
+            except OperationalError:
+                # 교착/잠금 대기 초과
+                db.rollback()
+                outcome = "lock_error"
+            finally:
+                db.close()
+            with lock:
+                results[outcome] += 1
+                if outcome == "ok":
+                    sold.update(quantities)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    final = remaining_stock(book_ids)
+    oversold = [book_id for book_id in book_ids if final[book_id] < 0 or final[book_id] != stock - sold[book_id]]
+    drop_hot_items(book_ids)
+
+    print(f"workers={workers} orders={orders} hot_items={hot_items} items/order={items_per_order} stock={stock}")
+    print(f"elapsed={elapsed:.2f}s throughput={orders / elapsed:.1f} orders/s")
+    print(f"ok={results['ok']} out_of_stock={results['out_of_stock']} lock_errors={results['lock_error']}")
+    print(f"remaining={final} oversold={'YES ' + str(oversold) if oversold else 'no'}")
+    return results, oversold
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="hot item 재고 차감 경합 벤치마크")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--hot-items", type=int, default=3)
+    parser.add_argument("--items-per-order", type=int, default=2)
+    parser.add_argument("--stock", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.workers, args.orders, args.hot_items, args.items_per_order, args.stock)
@@ -1,10 +1,11 @@
 # seed_data.py (수정본)
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.models import Base, Book, User, Review
+from app.models import Base, Book, BookStock, User, Review
 from app.utils import get_password_hash
 # get_db 대신 SessionLocal을 가져와야 합니다!
 from app.database import SessionLocal 
+from app.rating_stats import rebuild_rating_stats
 import random
 
 def init_db():
@@ -41,6 +42,7 @@ def init_db():
                     publisher=f"출판사 {i}",
                     price=random.randint(10000, 50000),
                     summary=f"이 책은 {i}번째 테스트 도서입니다.",
+                    stock=BookStock(stock=1000),
                 )
                 db.add(book)
             db.commit()
@@ -64,6 +66,9 @@ def init_db():
                 )
                 db.add(review)
             db.commit()
+            # 도서별 리뷰 집계 다시 계산
+            rebuild_rating_stats(db)
+            db.commit()
             print("✅ 리뷰 100개 생성 완료")
         
         print("🎉 총 210개 데이터 생성 끝!")
@@ -6,7 +6,10 @@ sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from fastapi.testclient import TestClient
 from app.main import app
+from app.database import SessionLocal
+from app.models import User, UserRole
 import pytest
+import uuid
 
 client = TestClient(app)
 
@@ -23,6 +26,23 @@ def get_auth_headers():
         return {"Authorization": f"Bearer {token}"}
     return None
 
+# --- 공통 헬퍼: 관리자 로그인 헤더 (테스트용 관리자 계정을 만들어서 사용) ---
+def get_admin_headers():
+    client.post("/api/signup", json={
+        "email": "admin_test@example.com",
+        "password": "password123",
+        "username": "AdminTest"
+    })
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == "admin_test@example.com").update({"role": UserRole.ADMIN})
+        db.commit()
+    finally:
+        db.close()
+    response = client.post("/api/auth/login", json={"email": "admin_test@example.com", "password": "password123"})
+    token = response.json()["payload"]["accessToken"]
+    return {"Authorization": f"Bearer {token}"}
+
 # ==========================================
 # 1. 시스템 & 인증 (System & Auth) - 5개
 # ==========================================
@@ -60,6 +80,29 @@ def test_login_success():
     assert response.status_code == 200
     assert "accessToken" in response.json()["payload"]
 
+# 3-1. bcrypt cost 가 다른 해시는 로그인 성공 시 현재 설정으로 재해싱
+def test_login_rehashes_outdated_cost():
+    from passlib.hash import bcrypt
+    from app.config import BCRYPT_ROUNDS
+
+    email = f"rehash_{uuid.uuid4().hex[:8]}@example.com"
+    db = SessionLocal()
+    try:
+        db.add(User(email=email, password=bcrypt.using(rounds=4).hash("password123"), username="Rehash", role=UserRole.USER))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/api/auth/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 200
+
+    db = SessionLocal()
+    try:
+        stored = db.query(User).filter(User.email == email).first().password
+        assert stored.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+    finally:
+        db.close()
+
 # 4. 로그인 실패 (비밀번호 틀림)
 def test_login_fail_password():
     response = client.post("/api/auth/login", json={
@@ -75,6 +118,23 @@ def test_logout():
     if headers:
         response = client.post("/api/auth/logout", headers=headers)
         assert response.status_code == 200
+        # 로그아웃된 토큰으로는 인증 불가
+        assert client.get("/api/users/me", headers=headers).status_code == 401
+
+# 5-0. 만료된 블랙리스트 토큰 정리
+def test_blocklist_prune_expired():
+    from datetime import datetime, timedelta
+    from app.blocklist import token_blocklist
+    from app.models import TokenBlocklist
+
+    db = SessionLocal()
+    try:
+        db.add(TokenBlocklist(token_hash=uuid.uuid4().hex, expires_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.commit()
+        assert token_blocklist.prune(db) >= 1
+        assert db.query(TokenBlocklist).filter(TokenBlocklist.expires_at <= datetime.utcnow()).count() == 0
+    finally:
+        db.close()
 
 # 5. 내 정보 조회 (인증 필요)
 def test_get_me():
@@ -84,6 +144,30 @@ def test_get_me():
         assert response.status_code == 200
         assert response.json()["payload"]["email"] == "user0@example.com"
 
+# 5-1. 인증 캐시: 두 번째 요청부터는 인증용 쿼리가 없어야 함, 탈퇴하면 즉시 401
+def test_auth_cache_and_withdraw_invalidation():
+    from sqlalchemy import event
+    from app.database import engine
+
+    email = f"auth_cache_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "AuthCache"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert client.get("/api/users/me", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert statements == []
+
+    assert client.delete("/api/users/me", headers=headers).json()["isSuccess"] is True
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+
 # ==========================================
 # 2. 도서 관리 (Books) - 4개
 # ==========================================
@@ -99,11 +183,110 @@ def test_search_books():
     response = client.get("/api/public/books?search=테스트")
     assert response.status_code == 200
 
+# 7-1. 관련도순 검색 (모든 결과가 검색어를 포함)
+def test_search_books_match_sort():
+    response = client.get("/api/public/books?search=도서 19&sort=match&size=5")
+    assert response.status_code == 200
+    content = response.json()["payload"]["content"]
+    assert content
+    for book in content:
+        text = f"{book['title']} {book['author']} {book['summary']}"
+        assert "도서" in text and "19" in text
+
+# 7-2. 역색인 첫 빌드: 동시에 검색이 들어와도 books 전체 조회는 한 번만
+def test_search_index_builds_once():
+    import asyncio
+    from sqlalchemy import event
+    from app.database import AsyncSessionLocal, async_engine
+    from app.search import book_search_index
+
+    statements = []
+    def count(conn, cursor, statement, *args):
+        if "FROM books" in statement:
+            statements.append(statement)
+
+    async def build(_):
+        async with AsyncSessionLocal() as db:
+            await book_search_index.ensure_built_async(db)
+
+    async def build_concurrently():
+        await asyncio.gather(*(build(i) for i in range(5)))
+
+    book_search_index.reset()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        asyncio.run(build_concurrently())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+    assert book_search_index.search("도서")
+
 # 8. 카테고리 필터링
 def test_filter_books_category():
     response = client.get("/api/public/books?category=IT")
     assert response.status_code == 200
 
+# 8-1. 커서 페이지네이션 (page 모드 결과와 이어지는지 확인)
+def test_books_cursor_pagination():
+    first = client.get("/api/public/books?size=5&sort=price,asc").json()["payload"]
+    assert first["nextCursor"]
+
+    second = client.get(f"/api/public/books?size=5&sort=price,asc&cursor={first['nextCursor']}").json()["payload"]
+    offset_page = client.get("/api/public/books?size=5&page=2&sort=price,asc").json()["payload"]
+    assert [b["book_id"] for b in second["content"]] == [b["book_id"] for b in offset_page["content"]]
+    # cursor 모드에서는 기본적으로 COUNT 를 생략
+    assert second["pagination"]["totalCount"] is None
+    # size 상한 (한 번에 전체 목록 조회 / 크기별 캐시 항목 남발 방지)
+    assert client.get("/api/public/books?size=101").status_code == 422
+
+# 8-2. 다른 정렬로 만든 커서는 거부
+def test_books_cursor_sort_mismatch():
+    first = client.get("/api/public/books?size=5&sort=price,asc").json()["payload"]
+    response = client.get(f"/api/public/books?size=5&sort=title,asc&cursor={first['nextCursor']}")
+    assert response.status_code == 400
+
+# 8-3. 도서 응답 캐시 (반복 조회는 hit, 관리자 수정 시 즉시 반영)
+def test_book_cache_hit_and_invalidation():
+    admin_headers = get_admin_headers()
+    created = client.post("/api/admin/books", json={
+        "title": "캐시 테스트 도서", "author": "캐시 저자", "publisher": "출판사", "price": 10000
+    }, headers=admin_headers)
+    book_id = created.json()["payload"]["book_id"]
+
+    before = client.get("/api/admin/stats/cache", headers=admin_headers).json()["payload"]["book_cache"]
+    client.get(f"/api/public/books/{book_id}")
+    etag_before_update = client.get(f"/api/public/books/{book_id}").headers["ETag"]
+    after = client.get("/api/admin/stats/cache", headers=admin_headers).json()["payload"]["book_cache"]
+    assert after["hits"] >= before["hits"] + 1
+
+    client.patch(f"/api/admin/books/{book_id}", json={
+        "title": "캐시 테스트 도서", "author": "캐시 저자", "publisher": "출판사", "price": 20000
+    }, headers=admin_headers)
+    detail = client.get(f"/api/public/books/{book_id}", headers={"If-None-Match": etag_before_update})
+    assert detail.status_code == 200
+    assert detail.json()["payload"]["price"] == 20000
+
+    client.delete(f"/api/admin/books/{book_id}", headers=admin_headers)
+    assert client.get(f"/api/public/books/{book_id}").json()["isSuccess"] is False
+
+# 8-4. ETag 조건부 요청 (캐시에 없어도 검증자만으로 304)
+def test_books_etag_not_modified():
+    from app.cache import book_cache
+
+    first = client.get("/api/public/books?size=5&sort=price,desc")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"]
+
+    book_cache.clear()
+    second = client.get("/api/public/books?size=5&sort=price,desc", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+
+    book_id = first.json()["payload"]["content"][0]["book_id"]
+    detail = client.get(f"/api/public/books/{book_id}")
+    book_cache.clear()
+    assert client.get(f"/api/public/books/{book_id}", headers={"If-None-Match": detail.headers["ETag"]}).status_code == 304
+
 # 9. 존재하지 않는 도서 상세 조회
 def test_get_book_not_found():
     response = client.get("/api/public/books/999999")
@@ -128,6 +311,104 @@ def test_get_cart():
         response = client.get("/api/carts", headers=headers)
         assert response.status_code == 200
 
+# 11-1. 장바구니 조회: 아이템 수와 상관없이 쿼리 1번, 합계 정확
+def test_get_cart_single_query():
+    from decimal import Decimal
+    from sqlalchemy import event
+    from app.database import async_engine
+
+    email = f"cart_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "Cart"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/carts", headers=headers).json()["payload"]["items"] == []
+    quantities = {1: 3, 2: 1, 3: 2}
+    for book_id, quantity in quantities.items():
+        client.post("/api/carts/items", json={"book_id": book_id, "quantity": quantity}, headers=headers)
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        payload = client.get("/api/carts", headers=headers).json()["payload"]
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+
+    assert {item["book_id"]: item["quantity"] for item in payload["items"]} == quantities
+    expected = sum(Decimal(str(item["price"])) * item["quantity"] for item in payload["items"])
+    assert Decimal(str(payload["total_price"])) == expected
+
+# 11-2. 장바구니 주문: 장바구니 그대로 주문 생성 + 비우기, 상품 수와 상관없이 문장 수 고정
+def test_cart_checkout():
+    from sqlalchemy import event
+    from app.database import engine
+
+    email = f"checkout_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "Checkout"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.post("/api/carts/checkout", headers=headers).json()["isSuccess"] is False
+
+    def checkout(quantities):
+        for book_id, quantity in quantities.items():
+            client.post("/api/carts/items", json={"book_id": book_id, "quantity": quantity}, headers=headers)
+        cart = client.get("/api/carts", headers=headers).json()["payload"]
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            payload = client.post("/api/carts/checkout", headers=headers).json()["payload"]
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert payload["total_amount"] == cart["total_price"]
+        return payload, len(statements)
+
+    _, one_count = checkout({1: 1})
+    payload, many_count = checkout({2: 2, 3: 1, 4: 3, 5: 1})
+    assert one_count == many_count
+    assert client.get("/api/carts", headers=headers).json()["payload"]["items"] == []
+
+    order = client.get("/api/orders?size=1", headers=headers).json()["payload"]["content"][0]
+    assert order["order_id"] == payload["order_id"]
+    assert {item["book_id"]: item["quantity"] for item in order["items"]} == {2: 2, 3: 1, 4: 3, 5: 1}
+
+# 11-3. 장바구니 수량이 0 이하면 담기 422, (이미 저장된) 음수 항목은 주문 거부 + 재고 그대로
+def test_cart_checkout_rejects_non_positive_quantity():
+    from app.models import BookStock, Cart, CartItem, Order
+
+    email = f"negative_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "Negative"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/api/carts/items", json={"book_id": 6, "quantity": -500}, headers=headers).status_code == 422
+    assert client.post("/api/carts/items", json={"book_id": 6, "quantity": 0}, headers=headers).status_code == 422
+    assert client.post("/api/carts/items", json={"book_id": 6, "quantity": 1}, headers=headers).json()["isSuccess"] is True
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.user_id).filter(User.email == email).scalar()
+        cart_id = db.query(Cart.cart_id).filter(Cart.user_id == user_id).scalar()
+        db.add(CartItem(cart_id=cart_id, book_id=7, quantity=-500))
+        db.commit()
+        stock_before = dict(db.query(BookStock.book_id, BookStock.stock).filter(BookStock.book_id.in_([6, 7])).all())
+    finally:
+        db.close()
+
+    assert client.post("/api/carts/checkout", headers=headers).status_code == 400
+
+    db = SessionLocal()
+    try:
+        stock_after = dict(db.query(BookStock.book_id, BookStock.stock).filter(BookStock.book_id.in_([6, 7])).all())
+        assert stock_after == stock_before
+        assert db.query(Order).filter(Order.user_id == user_id).count() == 0
+        assert db.query(CartItem).filter(CartItem.cart_id == cart_id).count() == 2
+    finally:
+        db.close()
+
 # 12. 장바구니 수량 변경
 def test_update_cart_qty():
     headers = get_auth_headers()
@@ -165,6 +446,33 @@ def test_add_wishlist():
             # 3. 성공(200)하거나, 이미 담겨있다(400/409)고 하면 통과!
             assert response.status_code in [200, 400, 409]
 
+# 13-1. 없는 도서는 위시리스트/장바구니에 담기 실패 (중복으로 처리되거나 담은 것처럼 응답하지 않음), 같은 도서는 수량 합산
+def test_add_missing_book_to_wishlist_and_cart():
+    from app.models import Cart, CartItem, Wishlist
+
+    email = f"missing_book_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "MissingBook"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    missing_book_id = 999_999_999
+
+    wish = client.post("/api/favorites", json={"book_id": missing_book_id}, headers=headers).json()
+    assert wish["isSuccess"] is False and wish["message"] == "도서를 찾을 수 없습니다."
+    cart = client.post("/api/carts/items", json={"book_id": missing_book_id, "quantity": 1}, headers=headers).json()
+    assert cart["isSuccess"] is False and cart["message"] == "도서를 찾을 수 없습니다."
+
+    for _ in range(2):
+        assert client.post("/api/carts/items", json={"book_id": 8, "quantity": 2}, headers=headers).json()["isSuccess"] is True
+    assert [(item["book_id"], item["quantity"]) for item in client.get("/api/carts", headers=headers).json()["payload"]["items"]] == [(8, 4)]
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.user_id).filter(User.email == email).scalar()
+        assert db.query(Wishlist).filter(Wishlist.user_id == user_id).count() == 0
+        assert db.query(CartItem).join(Cart).filter(Cart.user_id == user_id, CartItem.book_id == missing_book_id).count() == 0
+    finally:
+        db.close()
+
 # 14. 위시리스트 조회
 def test_get_wishlist():
     headers = get_auth_headers()
@@ -179,11 +487,163 @@ def test_create_review():
         response = client.post("/api/books/1/reviews", json={"rating": 5, "content": "Test Review"}, headers=headers)
         assert response.status_code == 200
 
+# 15-1. 평점 집계: 리뷰 작성/수정/삭제가 도서의 리뷰 수/평균/히스토그램에 바로 반영, 평점순 정렬
+def test_book_rating_stats():
+    headers = get_auth_headers()
+    admin = get_admin_headers()
+    book = {"title": "평점 집계 테스트", "author": "저자", "publisher": "출판사", "price": 10000}
+    book_id = client.post("/api/admin/books", json=book, headers=admin).json()["payload"]["book_id"]
+    assert client.get(f"/api/public/books/{book_id}").json()["payload"]["rating_stats"]["review_count"] == 0
+
+    for rating in (5, 5, 4, 2):
+        client.post(f"/api/books/{book_id}/reviews", json={"rating": rating, "content": "평점"}, headers=headers)
+    assert client.post(f"/api/books/{book_id}/reviews", json={"rating": 6, "content": "범위 밖"}, headers=headers).status_code == 400
+    review_ids = [r["review_id"] for r in client.get(f"/api/books/{book_id}/reviews").json()["payload"]["content"]]
+
+    # 2점 -> 3점 수정, 4점 삭제 => 5, 5, 3
+    client.patch(f"/api/reviews/{review_ids[0]}", json={"rating": 3}, headers=headers)
+    client.delete(f"/api/reviews/{review_ids[1]}", headers=headers)
+    stats = client.get(f"/api/public/books/{book_id}").json()["payload"]["rating_stats"]
+    assert stats["review_count"] == 3
+    assert stats["rating_avg"] == 4.33
+    assert stats["histogram"] == {"1": 0, "2": 0, "3": 1, "4": 0, "5": 2}
+
+    # 평점순 정렬: 커서로 이어서 조회해도 평균 내림차순
+    averages = []
+    cursor = ""
+    for _ in range(5):
+        payload = client.get(f"/api/public/books?sort=rating,desc&size=20{cursor}").json()["payload"]
+        averages += [b["rating_stats"]["rating_avg"] for b in payload["content"]]
+        if not payload["nextCursor"]:
+            break
+        cursor = f"&cursor={payload['nextCursor']}"
+    assert averages == sorted(averages, reverse=True)
+
 # 16. 특정 책의 리뷰 조회
 def test_get_book_reviews():
     response = client.get("/api/books/1/reviews")
     assert response.status_code == 200
 
+# 16-0. 리뷰 목록: 커서로 끝까지 이어서 조회, totalCount 는 미리 집계된 값
+def test_book_reviews_cursor_and_count():
+    headers = get_auth_headers()
+    book = {"title": "리뷰 목록 테스트", "author": "저자", "publisher": "출판사", "price": 10000}
+    book_id = client.post("/api/admin/books", json=book, headers=get_admin_headers()).json()["payload"]["book_id"]
+    for i in range(5):
+        client.post(f"/api/books/{book_id}/reviews", json={"rating": i % 5 + 1, "content": f"리뷰 {i}"}, headers=headers)
+
+    first = client.get(f"/api/books/{book_id}/reviews?size=2").json()["payload"]
+    assert first["totalCount"] == 5
+    assert first["content"][0]["username"]
+    seen = [r["review_id"] for r in first["content"]]
+    cursor = first["nextCursor"]
+    for _ in range(5):
+        if not cursor:
+            break
+        page = client.get(f"/api/books/{book_id}/reviews?size=2&cursor={cursor}").json()["payload"]
+        seen += [r["review_id"] for r in page["content"]]
+        cursor = page["nextCursor"]
+    assert seen == sorted(seen, reverse=True) and len(set(seen)) == 5
+
+    # 삭제하면 집계도 감소
+    assert client.delete(f"/api/reviews/{seen[0]}", headers=headers).json()["isSuccess"] is True
+    assert client.get(f"/api/books/{book_id}/reviews").json()["payload"]["totalCount"] == 4
+
+# 16-1. 좋아요: 중복 등록 방지 + 동시에 눌러도 증가분이 사라지지 않음
+def test_review_likes_atomic():
+    from concurrent.futures import ThreadPoolExecutor
+    from app.models import Review
+    from app.routers.likes import add_like, remove_like
+
+    db = SessionLocal()
+    try:
+        review = Review(user_id=1, book_id=1, rating=5, content="좋아요 테스트", likes=0)
+        db.add(review)
+        users = [User(email=f"like_{uuid.uuid4().hex[:8]}@example.com", password="x", username="Like") for _ in range(20)]
+        db.add_all(users)
+        db.commit()
+        review_id = review.review_id
+        user_ids = [user.user_id for user in users]
+    finally:
+        db.close()
+
+    def like(user_id):
+        session = SessionLocal()
+        try:
+            return add_like(session, review_id, user_id)
+        finally:
+            session.close()
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        list(pool.map(like, user_ids))
+
+    headers = get_auth_headers()
+    assert client.post(f"/api/reviews/{review_id}/like", headers=headers).json()["payload"]["likes"] == 21
+    assert client.post(f"/api/reviews/{review_id}/like", headers=headers).status_code == 409
+    assert client.delete(f"/api/reviews/{review_id}/like", headers=headers).json()["payload"]["likes"] == 20
+    assert client.delete(f"/api/reviews/{review_id}/like", headers=headers).status_code == 404
+    assert client.post("/api/reviews/999999/like", headers=headers).status_code == 404
+
+    db = SessionLocal()
+    try:
+        assert remove_like(db, review_id, user_ids[0]) == 19
+        assert db.query(Review.likes).filter(Review.review_id == review_id).scalar() == 19
+    finally:
+        db.close()
+
+# 16-2. 좋아요 write-behind: 버퍼에서 상쇄/합산 후 flush 때 한 번에 반영
+def test_review_likes_write_behind(monkeypatch):
+    from app.models import Review, ReviewLike
+    from app.like_buffer import LikeBuffer
+    import app.routers.likes as likes_router
+
+    db = SessionLocal()
+    try:
+        review = Review(user_id=1, book_id=1, rating=4, content="버퍼 테스트", likes=0)
+        db.add(review)
+        users = [User(email=f"buffer_{uuid.uuid4().hex[:8]}@example.com", password="x", username="Buffer") for _ in range(5)]
+        db.add_all(users)
+        db.commit()
+        review_id = review.review_id
+        user_ids = [user.user_id for user in users]
+    finally:
+        db.close()
+
+    buffer = LikeBuffer(enabled=True, max_pending=100)
+    monkeypatch.setattr(likes_router, "like_buffer", buffer)
+    db = SessionLocal()
+    try:
+        for user_id in user_ids:
+            buffer.like(db, review_id, user_id)
+        # 눌렀다 취소 -> 상쇄, 중복 좋아요 -> 409
+        assert buffer.unlike(db, review_id, user_ids[0]) == 4
+        with pytest.raises(Exception):
+            buffer.like(db, review_id, user_ids[1])
+        # 아직 DB 에는 반영 전
+        assert db.query(Review.likes).filter(Review.review_id == review_id).scalar() == 0
+    finally:
+        db.close()
+
+    headers = get_auth_headers()
+    assert client.post(f"/api/reviews/{review_id}/like", headers=headers).json()["payload"]["likes"] == 5
+    assert buffer.stats()["pending"] == 5
+
+    assert buffer.flush() == 5
+    db = SessionLocal()
+    try:
+        assert db.query(Review.likes).filter(Review.review_id == review_id).scalar() == 5
+        assert db.query(ReviewLike).filter(ReviewLike.review_id == review_id).count() == 5
+    finally:
+        db.close()
+
+    # flush 후 취소도 버퍼를 거쳐 반영
+    assert client.delete(f"/api/reviews/{review_id}/like", headers=headers).json()["payload"]["likes"] == 4
+    buffer.flush()
+    db = SessionLocal()
+    try:
+        assert db.query(Review.likes).filter(Review.review_id == review_id).scalar() == 4
+    finally:
+        db.close()
+
 # ==========================================
 # 5. 주문 & 통계 (Order & Stats) - 4개
 # ==========================================
@@ -195,6 +655,135 @@ def test_create_order():
         response = client.post("/api/orders", json={"items": [{"book_id": 1, "quantity": 1}]}, headers=headers)
         assert response.status_code == 200
 
+# 17-1. 주문 생성: 상품 수와 상관없이 쿼리 수 고정 + 합계/상세 저장 확인
+def test_create_order_constant_queries():
+    from sqlalchemy import event
+    from app.database import engine
+
+    headers = get_auth_headers()
+    client.get("/api/users/me", headers=headers)  # 인증 캐시 채우기
+
+    def place(items):
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            body = client.post("/api/orders", json={"items": items}, headers=headers).json()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert body["isSuccess"] is True
+        return body["payload"], len(statements)
+
+    _, one_count = place([{"book_id": 1, "quantity": 1}])
+    payload, many_count = place([{"book_id": book_id, "quantity": 2} for book_id in range(1, 7)])
+    assert one_count == many_count
+
+    order = next(o for o in client.get("/api/orders?size=5", headers=headers).json()["payload"]["content"]
+                 if o["order_id"] == payload["order_id"])
+    assert len(order["items"]) == 6
+    assert round(sum(i["price"] * i["quantity"] for i in order["items"]), 2) == payload["total_amount"]
+
+    # 없는 도서가 섞여 있으면 주문 자체가 만들어지지 않음
+    response = client.post("/api/orders", json={"items": [{"book_id": 1, "quantity": 1}, {"book_id": 999999, "quantity": 1}]}, headers=headers)
+    assert response.json()["isSuccess"] is False
+
+# 17-2. 재고: 조건부 차감, 부족하면 주문 전체 롤백, 취소/만료 시 복구 (PENDING 으로 되돌리기 거부), 동시 주문에도 초과 판매 없음
+def test_stock_reservation_cancel_and_expiry():
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timedelta
+    from app.inventory import release_expired_reservations, reserve_stock
+    from app.models import BookStock, Order, OrderStatus
+    from app.exceptions import CustomException
+
+    admin = get_admin_headers()
+    headers = get_auth_headers()
+    book = {"title": "재고 테스트", "author": "저자", "publisher": "출판사", "price": 10000, "stock": 3}
+    book_id = client.post("/api/admin/books", json=book, headers=admin).json()["payload"]["book_id"]
+
+    def stock(target=book_id):
+        db = SessionLocal()
+        try:
+            return db.query(BookStock.stock).filter(BookStock.book_id == target).scalar()
+        finally:
+            db.close()
+
+    def order(quantity, other=None):
+        items = [{"book_id": book_id, "quantity": quantity}] + ([{"book_id": other, "quantity": 1}] if other else [])
+        return client.post("/api/orders", json={"items": items}, headers=headers)
+
+    # 재고보다 많이 -> 400, 함께 주문한 다른 도서 재고도 그대로
+    other_before = stock(1)
+    response = order(4, other=1)
+    assert response.status_code == 400 and response.json()["code"] == "O001"
+    assert stock() == 3
+    assert stock(1) == other_before
+
+    first = order(2).json()["payload"]["order_id"]
+    second = order(1).json()["payload"]["order_id"]
+    assert stock() == 0
+    assert order(1).status_code == 400
+
+    # 관리자 취소 -> 복구, 다시 취소해도 두 번 복구되지 않음
+    assert client.patch(f"/api/admin/orders/{first}", json={"status": "CANCELLED"}, headers=admin).json()["isSuccess"] is True
+    assert client.patch(f"/api/admin/orders/{first}", json={"status": "CANCELLED"}, headers=admin).json()["isSuccess"] is False
+    assert stock() == 2
+
+    # PENDING 으로 변경은 거부 (확보 만료 시각이 그대로 남아서 아래 만료 정리 대상이 됨)
+    response = client.patch(f"/api/admin/orders/{second}", json={"status": "PENDING"}, headers=admin)
+    assert response.status_code == 400 and response.json()["code"] == "C001"
+    db = SessionLocal()
+    assert db.query(Order.reserved_until).filter(Order.order_id == second).scalar() is not None
+    db.close()
+
+    # 결제 없이 확보 시간이 지나면 정리 작업이 취소 + 복구
+    db = SessionLocal()
+    db.query(Order).filter(Order.order_id == second).update({"reserved_until": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+    assert release_expired_reservations() >= 1
+    assert stock() == 3
+    db = SessionLocal()
+    assert db.query(Order.status).filter(Order.order_id == second).scalar() == OrderStatus.CANCELLED
+    db.close()
+
+    # 동시 차감: 재고 3개에 10명이 동시에 1개씩 -> 정확히 3명만 성공
+    def buy(_):
+        db = SessionLocal()
+        try:
+            reserve_stock(db, {book_id: 1})
+            db.commit()
+            return True
+        except CustomException:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(buy, range(10)))
+    assert results.count(True) == 3
+    assert stock() == 0
+
+# 17-3. 주기 작업: 종료(취소) 시 스레드풀에서 실행 중인 작업이 끝난 뒤에 태스크가 끝남 (종료 처리와 겹치지 않음)
+def test_periodic_job_finishes_before_cancel():
+    import asyncio
+    import time
+    from app.background import run_periodic
+
+    finished = []
+    def job():
+        time.sleep(0.2)
+        finished.append(True)
+
+    async def start_and_cancel():
+        task = asyncio.create_task(run_periodic("test-job", 0.01, job))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return list(finished), task.cancelled()
+
+    assert asyncio.run(start_and_cancel()) == ([True], True)
+
 # 18. 내 주문 목록 조회
 def test_get_my_orders():
     headers = get_auth_headers()
@@ -202,6 +791,360 @@ def test_get_my_orders():
         response = client.get("/api/orders", headers=headers)
         assert response.status_code == 200
 
+# 18-1. 주문 목록: 주문/아이템 수와 상관없이 쿼리 수 고정 + 커서로 이어서 조회
+def test_my_orders_query_count_and_cursor():
+    from sqlalchemy import event
+    from app.database import engine
+
+    email = f"orders_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "username": "Orders"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "password123"}).json()["payload"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(5):
+        items = [{"book_id": 1, "quantity": 1}, {"book_id": 2, "quantity": 2}, {"book_id": 3, "quantity": 1}]
+        assert client.post("/api/orders", json={"items": items}, headers=headers).json()["isSuccess"] is True
+
+    def count_queries(url):
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = client.get(url, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        return response.json()["payload"], len(statements)
+
+    count_queries("/api/orders?size=1")  # 인증 캐시 채우기
+    small, small_count = count_queries("/api/orders?size=1")
+    full, full_count = count_queries("/api/orders?size=5")
+    assert len(full["content"]) == 5 and all(len(o["items"]) == 3 for o in full["content"])
+    assert full_count == small_count <= 2
+
+    # 커서로 나머지 페이지 조회 (중복/누락 없음)
+    seen = [o["order_id"] for o in small["content"]]
+    cursor = small["nextCursor"]
+    for _ in range(5):
+        if not cursor:
+            break
+        page, _ = count_queries(f"/api/orders?size=2&cursor={cursor}")
+        seen += [o["order_id"] for o in page["content"]]
+        cursor = page["nextCursor"]
+    assert seen == [o["order_id"] for o in full["content"]]
+
+# 18-2. 실행 계획: 라우터가 보내는 SELECT 가 인덱스 없이 테이블 전체를 읽지 않음 (EXPLAIN)
+def test_router_queries_use_indexes():
+    from app.cache import book_cache
+    from app.database import engine, async_engine
+    from app.query_plan import capture_queries, full_scans
+
+    headers = get_auth_headers()
+    book_cache.clear()
+    with capture_queries(engine, async_engine.sync_engine) as queries:
+        for sort in ("created_at,desc", "price,asc", "title,asc", "rating,desc", "review_count,desc"):
+            first = client.get(f"/api/public/books?size=5&sort={sort}").json()["payload"]
+            client.get(f"/api/public/books?size=5&sort={sort}&cursor={first['nextCursor']}")
+        client.get("/api/public/books/1")
+        first = client.get("/api/books/1/reviews?size=2").json()["payload"]
+        client.get(f"/api/books/1/reviews?size=2&cursor={first['nextCursor']}")
+        client.get("/api/reviews/me", headers=headers)
+        first = client.get("/api/orders?size=1", headers=headers).json()["payload"]
+        client.get(f"/api/orders?size=1&cursor={first['nextCursor']}", headers=headers)
+        client.post("/api/favorites", json={"book_id": 2}, headers=headers)
+        client.get("/api/favorites", headers=headers)
+        client.post("/api/carts/items", json={"book_id": 2, "quantity": 1}, headers=headers)
+        client.get("/api/carts", headers=headers)
+    assert queries
+
+    with engine.connect() as conn:
+        # 검사기 자체 확인: 인덱스 없는 컬럼 조건은 전체 스캔으로 잡혀야 함
+        assert full_scans(conn, "SELECT * FROM reviews WHERE content = ?", ("x",)) == ["reviews"]
+        scans = {statement: full_scans(conn, statement, parameters) for statement, parameters in queries}
+    assert {statement: tables for statement, tables in scans.items() if tables} == {}
+
+# 19. 커넥션 풀 메트릭 (관리자)
+def test_admin_db_pool_stats():
+    headers = get_admin_headers()
+    payload = client.get("/api/admin/stats/db-pool", headers=headers).json()["payload"]
+    assert payload["metrics"]["checkouts"] > 0
+    assert payload["metrics"]["wait_time_seconds"]["count"] > 0
+    assert "class" in payload["async_pool"]
+
+# 비동기 드라이버 URL 변환
+def test_async_db_url():
+    from app.database import to_async_url
+    assert to_async_url("mysql+pymysql://root:pw@localhost:3306/bookstore") == "mysql+aiomysql://root:pw@localhost:3306/bookstore"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+# 읽기 복제본 라우팅 (테스트 DB 를 복제본 2개로 등록)
+def test_read_replica_routing(monkeypatch):
+    from starlette.requests import Request
+    import app.database as database
+    replicas = database.ReplicaSet([str(database.engine.url)] * 2, max_failures=2)
+    monkeypatch.setattr(database, "replica_set", replicas)
+    try:
+        # round-robin
+        first, second = replicas.choose(), replicas.choose()
+        assert first is not second
+        # 연속 실패하면 제외되고, 응답하면 복귀
+        replicas.record_failure(first)
+        replicas.record_failure(first)
+        assert not first.healthy
+        assert {replicas.choose() for _ in range(4)} == {second}
+        replicas.check()
+        assert first.healthy
+
+        # 복제본으로 카탈로그 조회
+        assert client.get("/api/public/books/1").status_code == 200
+
+        # read-your-writes: 쓰기 직후에는 같은 클라이언트의 조회가 primary 로
+        headers = get_auth_headers()
+        scope = {"type": "http", "headers": [(b"authorization", headers["Authorization"].encode())], "client": ("testclient", 50000)}
+        assert database._read_replica(Request(scope)) is not None
+        client.post("/api/carts/items", json={"book_id": 1, "quantity": 1}, headers=headers)
+        assert database._read_replica(Request(scope)) is None
+        # 같은 IP 의 다른 사용자 / 비로그인 요청은 계속 복제본으로
+        other = {"type": "http", "headers": [(b"authorization", b"Bearer other-user")], "client": ("testclient", 50000)}
+        anonymous = {"type": "http", "headers": [], "client": ("testclient", 50000)}
+        assert database._read_replica(Request(other)) is not None
+        assert database._read_replica(Request(anonymous)) is not None
+    finally:
+        database.recent_writers.clear()
+        for replica in replicas.replicas:
+            replica.engine.dispose()
+
+# 19-1. /metrics: 라우트 템플릿별 요청 수/지연 시간, 요청당 DB 쿼리 수 (Prometheus text format)
+def test_prometheus_metrics():
+    from app.metrics import db_queries_per_request, http_requests_total
+
+    route = "/api/public/books/{book_id}"
+    before = http_requests_total.labels("GET", route, 200).value
+    queries_before = db_queries_per_request.labels("GET", route).snapshot()
+    client.get("/api/public/books/1", headers={"Cache-Control": "no-cache"})
+    client.get("/api/public/books/2")
+    client.get("/no/such/path")
+
+    assert http_requests_total.labels("GET", route, 200).value == before + 2
+    queries_after = db_queries_per_request.labels("GET", route).snapshot()
+    assert queries_after["count"] == queries_before["count"] + 2
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert f'http_request_duration_seconds_bucket{{method="GET",route="{route}",le="+Inf"}}' in body
+    assert f'http_requests_total{{method="GET",route="{route}",status="200"}}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/api/public/books/1" not in body  # 실제 URL 은 라벨로 쓰지 않음
+    assert 'http_requests_in_progress{method="GET"} 1' in body  # /metrics 요청 자신
+    # 수집 요청도 자기 라우트로 집계 (unmatched 에 섞이지 않음)
+    assert 'http_requests_total{method="GET",route="/metrics",status="200"}' in client.get("/metrics").text
+    assert "db_pool_checkouts_total" in body
+
+# 19-2. 요청 로그 미들웨어: 순수 ASGI (스트리밍 응답 그대로 전달), 샘플링해도 5xx/느린 요청은 항상 기록
+def test_request_logging_sampling():
+    import logging
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from app.request_logging import RequestLoggingMiddleware, access_logger
+
+    mini = FastAPI()
+
+    @mini.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    @mini.get("/fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    @mini.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    access_logger.addHandler(handler)
+    try:
+        mini.add_middleware(RequestLoggingMiddleware, sample_rate=0, slow_seconds=60)
+        mini_client = TestClient(mini, raise_server_exceptions=False)
+        assert mini_client.get("/ok").status_code == 200
+        assert mini_client.get("/stream").text == "abc"
+        assert mini_client.get("/fail").status_code == 500
+    finally:
+        access_logger.removeHandler(handler)
+
+    # 200 응답은 샘플링(0%)으로 빠지고 예외만 스택 트레이스와 함께 기록
+    assert len(records) == 1
+    assert records[0].levelno == logging.ERROR and records[0].exc_info
+    assert "/fail" in records[0].getMessage()
+
+    # 비동기 출력: 앱을 불러오기만 해서는 스레드가 없고, 종료하면 큐 핸들러를 떼서 이후 로그는 바로 출력
+    from logging.handlers import QueueHandler
+    from app.request_logging import start_async_access_log, stop_async_access_log
+    assert not any(isinstance(h, QueueHandler) for h in access_logger.handlers)
+    listener = start_async_access_log()
+    assert any(isinstance(h, QueueHandler) for h in access_logger.handlers)
+    stop_async_access_log(listener)
+    assert not any(isinstance(h, QueueHandler) for h in access_logger.handlers)
+    assert access_logger.propagate and listener._thread is None
+
+# 19-3. SQL 프로파일러: 요청별 쿼리 수/시간을 Server-Timing 헤더로 (요청 메트릭과 같은 집계), 같은 SQL 반복(N+1)과 느린 쿼리는 경고 로그
+def test_sql_profiler(monkeypatch):
+    import logging
+    from fastapi import FastAPI
+    from sqlalchemy import select
+    import app.database as database
+    from app.metrics import MetricsMiddleware, db_queries_per_request
+    from app.models import Book
+
+    mini = FastAPI()
+
+    @mini.get("/n-plus-one")
+    def n_plus_one():
+        db = SessionLocal()
+        try:
+            # 도서마다 한 번씩 조회 (N+1)
+            return [db.scalar(select(Book.title).where(Book.book_id == book_id)) for book_id in range(1, 7)]
+        finally:
+            db.close()
+
+    @mini.get("/single")
+    def single():
+        db = SessionLocal()
+        try:
+            return db.scalars(select(Book.title).where(Book.book_id.in_(range(1, 7)))).all()
+        finally:
+            db.close()
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    for logger in (database.profiler_logger, database.slow_query_logger):
+        logger.addHandler(handler)
+    try:
+        mini.add_middleware(database.QueryProfilerMiddleware, n_plus_one_threshold=5)
+        mini.add_middleware(MetricsMiddleware)
+        mini_client = TestClient(mini)
+        before = db_queries_per_request.labels("GET", "/n-plus-one").snapshot()["sum"]
+        timing = mini_client.get("/n-plus-one").headers["server-timing"]
+        assert 'desc="6 queries"' in timing and "db-slowest;dur=" in timing
+        # 요청 메트릭도 같은 집계를 씀 (두 번 세지 않음)
+        assert db_queries_per_request.labels("GET", "/n-plus-one").snapshot()["sum"] == before + 6
+        assert [r.name for r in records] == ["app.sql.profiler"]
+        assert "same statement ran 6 times" in records[0].getMessage()
+
+        records.clear()
+        assert 'desc="1 queries"' in mini_client.get("/single").headers["server-timing"]
+        assert records == []
+
+        # 느린 쿼리 로그 (기준을 아주 작게)
+        monkeypatch.setattr(database, "SQL_SLOW_QUERY_SECONDS", 1e-9)
+        mini_client.get("/single")
+        assert [r.name for r in records] == ["app.sql.slow"]
+        assert "Slow query" in records[0].getMessage()
+    finally:
+        for logger in (database.profiler_logger, database.slow_query_logger):
+            logger.removeHandler(handler)
+
+# 19-4. 응답 직렬화: response_model 재검증 없이 보낸 응답도 스키마와 같은 JSON, 캐시 히트는 저장된 본문 그대로
+def test_trusted_model_responses():
+    from app.cache import book_cache
+    from fastapi.responses import JSONResponse
+    from app.responses import FastJSONResponse
+    from app.schemas import APIResponse, BookListResponse, BookDto, OrderListResponse, CartListResponse
+
+    book_cache.clear()
+    first = client.get("/api/public/books?size=30&sort=price,asc")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.headers["etag"] and first.headers["cache-control"]
+    parsed = APIResponse[BookListResponse].model_validate_json(first.content)
+    assert first.json() == parsed.model_dump(mode="json")
+    assert len(parsed.payload.content) == 30
+
+    # 캐시 히트: 같은 바이트 + 같은 헤더, If-None-Match 는 304
+    second = client.get("/api/public/books?size=30&sort=price,asc")
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert client.get("/api/public/books?size=30&sort=price,asc",
+                      headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    book_id = parsed.payload.content[0].book_id
+    detail = client.get(f"/api/public/books/{book_id}")
+    assert detail.headers["etag"]
+    assert APIResponse[BookDto].model_validate_json(detail.content).payload.book_id == book_id
+
+    headers = get_auth_headers()
+    if headers:
+        orders = client.get("/api/orders", headers=headers)
+        assert APIResponse[OrderListResponse].model_validate_json(orders.content).isSuccess
+        cart = client.get("/api/carts", headers=headers)
+        assert APIResponse[CartListResponse].model_validate_json(cart.content).isSuccess
+
+    # 에러 응답 (dict) 도 표준 json 과 같은 출력
+    content = {"code": "NOT_FOUND", "message": "없음", "details": {}}
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+# 19-5. 응답 압축: Accept-Encoding 협상, 작은 본문/에러 응답은 그대로, 스트리밍 응답도 압축
+def test_response_compression():
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import StreamingResponse
+    from app.compression import CompressionMiddleware, negotiate_encoding, brotli
+
+    assert negotiate_encoding("gzip, deflate", brotli_enabled=False) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*;q=0.5", brotli_enabled=False) == "gzip"
+    assert negotiate_encoding("br;q=1.0, gzip;q=0.8") == ("br" if brotli else "gzip")
+
+    mini = FastAPI()
+    big = {"content": [{"title": f"도서 {i}", "summary": "반복되는 요약 " * 10} for i in range(50)]}
+
+    @mini.get("/big")
+    def get_big():
+        return big
+
+    @mini.get("/small")
+    def get_small():
+        return {"ok": True}
+
+    @mini.get("/missing")
+    def get_missing():
+        raise HTTPException(status_code=404, detail="x" * 2000)
+
+    @mini.get("/stream")
+    def get_stream():
+        return StreamingResponse((f'{{"row": {i}}}\n'.encode() for i in range(200)), media_type="application/json")
+
+    mini.add_middleware(CompressionMiddleware, minimum_size=500, brotli_enabled=False)
+    mini_client = TestClient(mini)
+
+    response = mini_client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == big
+
+    assert "content-encoding" not in mini_client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in mini_client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    missing = mini_client.get("/missing", headers={"Accept-Encoding": "gzip"})
+    assert missing.status_code == 404 and "content-encoding" not in missing.headers
+
+    stream = mini_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert stream.headers["content-encoding"] == "gzip" and "content-length" not in stream.headers
+    assert stream.text.splitlines()[199] == '{"row": 199}'
+
+    # 실제 앱: 도서 목록은 압축 + weak ETag (If-None-Match 는 그대로 304)
+    books = client.get("/api/public/books?size=50", headers={"Accept-Encoding": "gzip"})
+    assert books.headers["content-encoding"] == "gzip"
+    assert books.headers["etag"].startswith('W/"')
+    assert books.json()["payload"]["content"]
+    assert client.get("/api/public/books?size=50",
+                      headers={"Accept-Encoding": "gzip", "If-None-Match": books.headers["etag"]}).status_code == 304
+
 # 20. 관리자 통계 (권한 없어서 실패해야 함 - 일반 유저 기준)
 def test_admin_stats_fail():
     headers = get_auth_headers()